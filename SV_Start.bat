@@ -7,6 +7,8 @@ color 0A
 REM === BASE DIR ===
 set BASEDIR=%~dp0
 cd /d "%BASEDIR%"
+REM Root passata agli entrypoint Python (evita la risoluzione del path in modules\_bootstrap.py)
+set SV_ROOT=%BASEDIR%
 
 echo.
 echo ================================================
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SV - Path Bootstrap
+Setup di sys.path condiviso dagli entrypoint in modules/ (trigger_*)
+"""
+
+import os
+import sys
+from pathlib import Path
+
+__all__ = ['project_root']
+
+# SV_ROOT (impostata dal launcher) evita resolve() e le relative lstat a ogni avvio;
+# senza variabile si ricava la root dal percorso di questo file
+project_root = Path(os.environ.get('SV_ROOT') or Path(__file__).resolve().parent.parent)
+
+_DONE = False
+
+
+def _setup_paths() -> None:
+    """Aggiunge project root e config/modules a sys.path una sola volta, senza duplicati"""
+    global _DONE
+    if _DONE:
+        return
+    for path in (str(project_root), str(project_root / 'config' / 'modules')):
+        if path not in sys.path:
+            sys.path.append(path)
+    _DONE = True
+
+
+_setup_paths()
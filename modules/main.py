@@ -35,6 +35,10 @@ class SVOrchestrator:
         """Initialize SV Orchestrator"""
         self.running = False
         self.check_interval = 30  # Base poll every 30 seconds (lightweight)
+        # Upper bound when sleeping until the next scheduled event, so manual
+        # flag resets and clock changes are still picked up reasonably fast
+        self.max_sleep = 5 * 60  # seconds
+        self._has_pending = False
         # Throttle attempts: run each pending content at most once every 30 minutes
         self.pending_retry_interval = 30 * 60  # seconds
         self._last_attempt = {}  # content_type -> epoch seconds
@@ -65,6 +69,7 @@ class SVOrchestrator:
             # Get current status
             status = get_status()
             pending_content = get_pending()
+            self._has_pending = bool(pending_content)
             
             log.info(f"[CHECK] Check cycle - Time: {status['current_time']}, Pending: {pending_content}")
             
@@ -129,6 +134,24 @@ class SVOrchestrator:
         except Exception as e:
             log.error(f"âŒ Error running trigger {content_type}: {e}")
 
+    def _next_sleep(self) -> float:
+        """Seconds to sleep before the next check cycle.
+
+        While content is pending (deferred retries) keep the base interval;
+        otherwise sleep until the next scheduled event or heartbeat.
+        """
+        if self._has_pending:
+            return self.check_interval
+        try:
+            from sv_scheduler import seconds_until_next
+            wait = seconds_until_next()
+        except Exception as e:
+            log.debug(f"[DEBUG] Next event unknown, using base interval: {e}")
+            return self.check_interval
+
+        heartbeat_due = self.heartbeat_interval - (time.time() - self._last_heartbeat)
+        return max(1.0, min(wait, heartbeat_due, self.max_sleep))
+
     def run_engine_brain_heartbeat(self):
         """Run a lightweight ENGINE+BRAIN heartbeat snapshot (no message generation)."""
         try:
@@ -152,8 +175,8 @@ class SVOrchestrator:
             while self.running:
                 self.run_single_check()
                 
-                # Sleep for check interval
-                time.sleep(self.check_interval)
+                # Sleep until something can become due
+                time.sleep(self._next_sleep())
                 
         except KeyboardInterrupt:
             log.info("â¹ï¸ Received keyboard interrupt, stopping...")
@@ -6,30 +6,59 @@ Sistema di scheduling intelligente con calendar integration
 """
 
 from pathlib import Path
+from bisect import bisect_right
+from contextlib import contextmanager
+import calendar
+import copy
 import datetime
-import pytz
 import json
 import os
 import sys
 import logging
-from typing import Dict, Optional, List
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Optional
+from zoneinfo import ZoneInfo
 
-# Add project root to Python path
-project_root = Path(__file__).resolve().parent.parent
-sys.path.append(str(project_root))
+try:
+    import fcntl  # POSIX advisory locks
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Add project root to Python path (SV_ROOT-aware, shared with the triggers)
+from _bootstrap import project_root
 
 from config import sv_paths
 
-# Import SV Calendar for market intelligence
-from modules.sv_calendar import SVCalendarSystem
+if TYPE_CHECKING:
+    # SV Calendar (market intelligence) is imported lazily, see SVScheduler.calendar
+    from modules.sv_calendar import SVCalendarSystem
 
 log = logging.getLogger(__name__)
 
-ITALY_TZ = pytz.timezone("Europe/Rome")
+# stdlib zoneinfo (C implementation) instead of pytz on this hot path
+ITALY_TZ = ZoneInfo("Europe/Rome")
+_dt_now = datetime.datetime.now
+
+FLAGS_SCHEMA_VERSION = 3
+
+# Market intelligence is reused for this many seconds (one scheduler tick)
+_INTEL_TTL_SECONDS = 30
+
+# Module-level get_status() results are shared for this many seconds
+_STATUS_TTL_SECONDS = 30
+
+# Report folders, resolved once at import: (subfolder name, full path)
+_REPORTS_ROOT = os.path.join(project_root, 'reports')
+_REPORT_DIRS = tuple(
+    (name, os.path.join(_REPORTS_ROOT, name))
+    for name in ('1_daily', '2_weekly', '3_monthly', '4_quarterly', '5_semestral')
+)
 
 def _now_it():
     """Get current time in Italian timezone"""
-    return datetime.datetime.now(ITALY_TZ)
+    return _dt_now(ITALY_TZ)
 
 def _today_key(dt=None):
     """Get today key for date tracking"""
@@ -39,11 +68,45 @@ class SVScheduler:
     """
     Enhanced scheduler with market intelligence for SV content generation
     """
+
+    # Directories are prepared once per process (see ensure_directories)
+    _dirs_ready = False
+
+    # Fixed attribute set: no per-instance __dict__, faster attribute access.
+    # New instance attributes must be declared here.
+    __slots__ = (
+        '_calendar',
+        'schedule',
+        '_schedule_hm',
+        '_schedule_mod',
+        '_schedule_by_minute',
+        '_schedule_minutes',
+        '_last_key',
+        '_sent_key',
+        '_flag_bit',
+        'market_adjustments',
+        'flags_file',
+        '_last_serialized',
+        'flags',
+        '_intel_cache',
+        '_day_facts_key',
+        '_day_facts',
+        '_all_sent_until',
+    )
     
     def __init__(self):
         """Initialize SV Enhanced Scheduler"""
-        # Initialize calendar system for market intelligence
-        self.calendar = SVCalendarSystem()
+        # Calendar system for market intelligence is built on first use
+        # (see the ``calendar`` property); most checks never need it.
+        self._calendar = None
+        # (monotonic timestamp, intelligence dict) from the last calendar lookup
+        self._intel_cache = (0.0, None)
+        # Calendar facts for one date (weekday, month-end...), see _refresh_day_facts
+        self._day_facts_key = None
+        self._day_facts: Dict[str, object] = {}
+        # (next midnight, flags file mtime_ns) once every content due today is
+        # sent; lets get_pending_content return [] without evaluating slots
+        self._all_sent_until = None
 
         # Base schedule (Italy timezone) - every 3 hours as per integrated spec
         # 00:00 Night
@@ -69,6 +132,25 @@ class SVScheduler:
             "semestral": "09:20",        # Semestral report
         }
 
+        # Parsed (hour, minute) per content type, plus the same entries sorted by
+        # minute-of-day so get_pending_content only visits slots already due.
+        self._schedule_hm = {
+            ct: tuple(map(int, hhmm.split(':'))) for ct, hhmm in self.schedule.items()
+        }
+        # Minute-of-day per content type: the hot time check is an int compare
+        self._schedule_mod = {ct: h * 60 + m for ct, (h, m) in self._schedule_hm.items()}
+        self._schedule_by_minute = sorted(
+            (minute, ct) for ct, minute in self._schedule_mod.items()
+        )
+        self._schedule_minutes = [minute for minute, _ in self._schedule_by_minute]
+
+        # Flag key names per content type, built once instead of per check.
+        # Interned, and used to seed self.flags, so flag lookups hit on identity.
+        self._last_key = {ct: sys.intern(f"{ct}_last_sent_period") for ct in self.schedule}
+        self._sent_key = {ct: sys.intern(f"{ct}_sent") for ct in self.schedule}
+        # One bit per content type for compact "sent this period" sets
+        self._flag_bit = {ct: 1 << i for i, ct in enumerate(self.schedule)}
+
         # Market-aware scheduling adjustments
         self.market_adjustments = {
             "PRE_MARKET": {"priority": "high", "frequency_modifier": 1.2},
@@ -82,39 +164,68 @@ class SVScheduler:
         # This avoids midnight reset races (00:00 content) and removes the need
         # for a global daily reset.
         self.flags_file = sv_paths.FLAGS_FILE
+        # Exact text of the flags file as last read/written; lets save_flags
+        # skip rewriting a file whose content would not change.
+        self._last_serialized = ""
         self.flags: Dict[str, object] = {
-            "schema_version": 2,
+            # v3: only *_last_sent_period is persisted (derived *_sent dropped)
+            "schema_version": FLAGS_SCHEMA_VERSION,
             # kept for backward compatibility / legacy inspection only
             "last_reset_date": _today_key(),
         }
+        # Derived *_sent booleans are not kept here: get_status() computes them
+        # on demand for backward-compat consumers (see _derived_sent_flags).
         for ct in self.schedule.keys():
-            self.flags[f"{ct}_last_sent_period"] = ""
-            # derived/status convenience (also kept for backward-compat consumers)
-            self.flags[f"{ct}_sent"] = False
+            self.flags[self._last_key[ct]] = ""
 
         self.ensure_directories()
         self.load_flags()
         
+    @property
+    def calendar(self) -> "SVCalendarSystem":
+        """Calendar system for market intelligence (lazily constructed).
+
+        The import is deferred too, so flag-only users of this module (e.g.
+        reset helpers, is_time_for after warm-up) never load sv_calendar.
+        """
+        if self._calendar is None:
+            from modules.sv_calendar import SVCalendarSystem
+            self._calendar = SVCalendarSystem()
+        return self._calendar
+
     def ensure_directories(self):
-        """Create necessary directories"""
+        """Create necessary directories (once per process)."""
+        if SVScheduler._dirs_ready:
+            return
+
         try:
             sv_paths.setup_all_directories()
         except Exception as e:
             log.error(f"Error preparing config directories: {e}")
 
-        report_dirs = [
-            os.path.join(project_root, 'reports', '1_daily'),
-            os.path.join(project_root, 'reports', '2_weekly'),
-            os.path.join(project_root, 'reports', '3_monthly'),
-            os.path.join(project_root, 'reports', '4_quarterly'),
-            os.path.join(project_root, 'reports', '5_semestral')
-        ]
+        # One scandir of reports/ instead of a makedirs stat chain per subfolder
+        reports_root = _REPORTS_ROOT
+        existing = set()
+        try:
+            with os.scandir(reports_root) as entries:
+                existing = {e.name for e in entries if e.is_dir()}
+        except FileNotFoundError:
+            try:
+                os.makedirs(reports_root, exist_ok=True)
+            except Exception as e:
+                log.error(f"Error creating directory {reports_root}: {e}")
+        except Exception as e:
+            log.error(f"Error scanning directory {reports_root}: {e}")
 
-        for directory in report_dirs:
+        for name, directory in _REPORT_DIRS:
+            if name in existing:
+                continue
             try:
                 os.makedirs(directory, exist_ok=True)
             except Exception as e:
                 log.error(f"Error creating directory {directory}: {e}")
+
+        SVScheduler._dirs_ready = True
     
     def _period_key(self, content_type: str, now: Optional[datetime.datetime] = None) -> str:
         """Return the dedupe key for a content type.
@@ -127,30 +238,72 @@ class SVScheduler:
         """
         if now is None:
             now = _now_it()
+        y, m = now.year, now.month
 
-        if content_type in ("weekly",):
+        if content_type == "weekly":
             iso_year, iso_week, _ = now.isocalendar()
             return f"{iso_year}-W{iso_week:02d}"
-        if content_type in ("monthly",):
-            return now.strftime("%Y-%m")
-        if content_type in ("quarterly",):
-            q = ((now.month - 1) // 3) + 1
-            return f"{now.year}-Q{q}"
-        if content_type in ("semestral",):
-            half = "H1" if now.month <= 6 else "H2"
-            return f"{now.year}-{half}"
-
-        # Default: daily
-        return _today_key(now)
-
-    def _sync_derived_sent_flags(self, now: Optional[datetime.datetime] = None) -> None:
-        """Update *_sent booleans based on *_last_sent_period for current time."""
+        if content_type == "monthly":
+            return f"{y:04d}-{m:02d}"
+        if content_type == "quarterly":
+            return f"{y}-Q{(m - 1) // 3 + 1}"
+        if content_type == "semestral":
+            return f"{y}-H{1 if m <= 6 else 2}"
+
+        # Default: daily (same format as _today_key)
+        return f"{y:04d}{m:02d}{now.day:02d}"
+
+    def _sent_mask(self, now: Optional[datetime.datetime] = None) -> int:
+        """Bitmask (see ``_flag_bit``) of content already sent for its current period."""
         if now is None:
             now = _now_it()
-        for ct in self.schedule.keys():
-            period_now = self._period_key(ct, now)
-            last_key = f"{ct}_last_sent_period"
-            self.flags[f"{ct}_sent"] = (self.flags.get(last_key, "") == period_now)
+        mask = 0
+        for ct, bit in self._flag_bit.items():
+            if self.flags.get(self._last_key[ct], "") == self._period_key(ct, now):
+                mask |= bit
+        return mask
+
+    def _derived_sent_flags(self, now: Optional[datetime.datetime] = None) -> Dict[str, bool]:
+        """Compute *_sent booleans from *_last_sent_period for current time."""
+        mask = self._sent_mask(now)
+        return {self._sent_key[ct]: bool(mask & bit) for ct, bit in self._flag_bit.items()}
+
+    @contextmanager
+    def _with_file_lock(self, exclusive: bool = True):
+        """Hold a cross-process lock on the flags file for a read-modify-write cycle.
+
+        Uses a ``.lock`` sibling of the flags file (flock on POSIX, msvcrt on
+        Windows, which only supports exclusive locks). Locking failures are
+        logged and the block runs unlocked rather than blocking the scheduler.
+        """
+        lock_file = None
+        locked = False
+        try:
+            lock_path = Path(str(self.flags_file) + ".lock")
+            lock_path.parent.mkdir(parents=True, exist_ok=True)
+            lock_file = open(lock_path, 'a+b')
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            locked = True
+        except Exception as e:
+            log.warning(f"[SCHEDULER] Flags lock unavailable, continuing unlocked: {e}")
+
+        try:
+            yield
+        finally:
+            if lock_file is not None:
+                try:
+                    if locked:
+                        if fcntl is not None:
+                            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                        else:
+                            lock_file.seek(0)
+                            msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+                finally:
+                    lock_file.close()
 
     def load_flags(self):
         """Load flags from file (migration-safe, no resets)."""
@@ -159,9 +312,14 @@ class SVScheduler:
             saved_flags: Dict[str, object] = {}
             if os.path.exists(self.flags_file):
                 with open(self.flags_file, 'r', encoding='utf-8') as f:
-                    saved_flags = json.load(f) or {}
+                    raw = f.read()
+                    self._last_serialized = raw
+                    saved_flags = json.loads(raw) or {}
                     if isinstance(saved_flags, dict):
-                        self.flags.update(saved_flags)
+                        # Derived *_sent booleans are never kept in memory
+                        self.flags.update(
+                            (k, v) for k, v in saved_flags.items() if not k.endswith("_sent")
+                        )
                         log.info("ðŸ“„ Flags loaded from file")
 
             # Migration from legacy schema:
@@ -171,8 +329,8 @@ class SVScheduler:
             today_key = _today_key(now)
 
             for ct in self.schedule.keys():
-                last_key = f"{ct}_last_sent_period"
-                bool_key = f"{ct}_sent"
+                last_key = self._last_key[ct]
+                bool_key = self._sent_key[ct]
 
                 # Ensure keys exist
                 if last_key not in self.flags:
@@ -195,28 +353,38 @@ class SVScheduler:
 
             # Keep last_reset_date up to date as informational field
             self.flags["last_reset_date"] = today_key
-
-            # Refresh derived booleans
-            self._sync_derived_sent_flags(now)
+            # Older files (v2 and earlier) are upgraded on their next save
+            self.flags["schema_version"] = FLAGS_SCHEMA_VERSION
 
         except Exception as e:
             log.error(f"âŒ Error loading flags: {e}")
 
     def save_flags(self):
-        """Save flags to file (atomic write to avoid partial/corrupt JSON)."""
+        """Save flags to file (atomic write to avoid partial/corrupt JSON).
+
+        Mutators call this right away, while they still hold the exclusive
+        flags lock: the cross-process read-modify-write only holds if the
+        write lands before the lock is released, so writes are not debounced.
+        Unchanged content is not rewritten (see ``_last_serialized``).
+        """
         try:
-            now = _now_it()
-            self._sync_derived_sent_flags(now)
+            # Persist only the source of truth; *_sent is recomputed on read
+            persist = {k: v for k, v in self.flags.items() if not k.endswith("_sent")}
+            payload = json.dumps(persist, indent=2, ensure_ascii=False)
+            if payload == self._last_serialized:
+                log.debug("[SCHEDULER] Flags unchanged, skipping write")
+                return
 
             flags_path = Path(self.flags_file)
             flags_path.parent.mkdir(parents=True, exist_ok=True)
 
             tmp_path = flags_path.with_suffix(flags_path.suffix + ".tmp")
             with open(tmp_path, 'w', encoding='utf-8') as f:
-                json.dump(self.flags, f, indent=2, ensure_ascii=False)
+                f.write(payload)
 
             # Atomic replace on Windows when source/dest are on same filesystem
             os.replace(str(tmp_path), str(flags_path))
+            self._last_serialized = payload
             log.debug("ðŸ’¾ Flags saved to file")
         except Exception as e:
             log.error(f"âŒ Error saving flags: {e}")
@@ -224,43 +392,60 @@ class SVScheduler:
     def reset_daily_flags(self):
         """Legacy reset hook (kept for compatibility).
 
-        In schema v2 we do not reset flags globally; we dedupe by period keys.
+        Since schema v2 we do not reset flags globally; we dedupe by period keys.
         This method now clears only the stored last_sent_period keys for daily content.
+        Changes stay in memory; nothing is written to the flags file.
         """
         for ct in ("night", "late_night", "press_review", "morning", "noon", "afternoon", "evening", "summary"):
-            self.flags[f"{ct}_last_sent_period"] = ""
-        self._sync_derived_sent_flags(_now_it())
+            self.flags[self._last_key[ct]] = ""
+        self._all_sent_until = None
 
-    def is_weekend(self) -> bool:
+    def _refresh_day_facts(self, now: Optional[datetime.datetime] = None) -> Dict[str, object]:
+        """Return calendar facts for the date of ``now``, recomputed only when the date changes."""
+        if now is None:
+            now = _now_it()
+        key = (now.year, now.month, now.day)
+        if key != self._day_facts_key:
+            weekday = now.weekday()
+            days_in_month = calendar.monthrange(now.year, now.month)[1]
+            self._day_facts = {
+                "weekday": weekday,
+                "day": now.day,
+                "month": now.month,
+                "is_weekend": weekday >= 5,
+                "is_last_day_of_month": now.day == days_in_month,
+                # Last 7 days of month
+                "is_last_week_of_month": days_in_month - now.day <= 6,
+            }
+            self._day_facts_key = key
+        return self._day_facts
+
+    def is_weekend(self, now: Optional[datetime.datetime] = None) -> bool:
         """Check if today is weekend"""
-        return _now_it().weekday() >= 5
+        return self._refresh_day_facts(now)["is_weekend"]
 
-    def is_last_day_of_month(self) -> bool:
+    def is_last_day_of_month(self, now: Optional[datetime.datetime] = None) -> bool:
         """Check if today is last day of month"""
-        today = _now_it().date()
-        tomorrow = today + datetime.timedelta(days=1)
-        return tomorrow.day == 1
+        return self._refresh_day_facts(now)["is_last_day_of_month"]
     
-    def is_last_week_of_month(self) -> bool:
+    def is_last_week_of_month(self, now: Optional[datetime.datetime] = None) -> bool:
         """Check if today is in the last week of the month.
 
         Currently not used by the automatic scheduler loop; kept for potential
         future refinements (e.g. special handling on month-end).
         """
-        today = _now_it().date()
-        # Get last day of current month
-        if today.month == 12:
-            next_month = today.replace(year=today.year + 1, month=1, day=1)
-        else:
-            next_month = today.replace(month=today.month + 1, day=1)
-        last_day_of_month = next_month - datetime.timedelta(days=1)
-        
-        # Check if today is within 7 days of month end
-        days_until_end = (last_day_of_month - today).days
-        return days_until_end <= 6  # Last 7 days of month
+        return self._refresh_day_facts(now)["is_last_week_of_month"]
     
     def get_market_intelligence(self) -> dict:
-        """Get current market intelligence from calendar system"""
+        """Get current market intelligence from calendar system.
+
+        Results are cached for ``_INTEL_TTL_SECONDS`` so a scheduler tick
+        queries the calendar once instead of once per content check.
+        """
+        cached_at, cached = self._intel_cache
+        if cached is not None and time.monotonic() - cached_at < _INTEL_TTL_SECONDS:
+            return cached
+
         try:
             # Get day context
             day_context = self.calendar.get_day_context()
@@ -274,7 +459,8 @@ class SVScheduler:
                 "market_status": market_status,
                 **day_context
             }
-            
+
+            self._intel_cache = (time.monotonic(), intelligence)
             return intelligence
             
         except Exception as e:
@@ -286,17 +472,19 @@ class SVScheduler:
                 "intelligence": ["Market intelligence unavailable"]
             }
     
-    def is_high_priority_time(self) -> bool:
+    def is_high_priority_time(self, market_intel: Optional[dict] = None) -> bool:
         """Check if current time requires high priority content generation"""
-        market_intel = self.get_market_intelligence()
+        if market_intel is None:
+            market_intel = self.get_market_intelligence()
         market_status = market_intel.get("market_status", "UNKNOWN")
         
         # High priority during market open and pre-market
         return market_status in ["MARKET_OPEN", "PRE_MARKET"]
     
-    def get_content_priority(self, content_type: str) -> str:
+    def get_content_priority(self, content_type: str, market_intel: Optional[dict] = None) -> str:
         """Get priority level for content type based on market conditions"""
-        market_intel = self.get_market_intelligence()
+        if market_intel is None:
+            market_intel = self.get_market_intelligence()
         market_status = market_intel.get("market_status", "UNKNOWN")
         
         base_priority = self.market_adjustments.get(market_status, {}).get("priority", "medium")
@@ -325,155 +513,234 @@ class SVScheduler:
         # Weekend or closed market - stick to schedule
         return False
 
-    def is_time_for_content(self, content_type: str) -> bool:
-        """Check if it's time for specific content type with market intelligence"""
-        now = _now_it()
-        scheduled_time = self.schedule.get(content_type)
-        
-        if not scheduled_time:
+    def is_time_for_content(self, content_type: str, now: Optional[datetime.datetime] = None) -> bool:
+        """Check if it's time for specific content type.
+
+        Market status does not gate any content (daily content runs on
+        weekdays, weekends and closed markets alike), so no market
+        intelligence lookup is needed here.
+        """
+        scheduled_mod = self._schedule_mod.get(content_type)
+        if scheduled_mod is None:
             return False
-            
-        # Parse scheduled time
-        hour, minute = map(int, scheduled_time.split(':'))
-        
-        # Create scheduled datetime for today
-        scheduled_dt = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-        
+
+        if now is None:
+            now = _now_it()
+
         # Check if current time has passed the scheduled time (catch-up logic)
         # Allow content if we're past scheduled time but haven't sent yet
-        time_match = now >= scheduled_dt
-        
-        # Get market intelligence for context-aware scheduling
-        market_intel = self.get_market_intelligence()
-        market_status = market_intel.get("market_status", "UNKNOWN")
-        
+        if now.hour * 60 + now.minute < scheduled_mod:
+            return False
+
         # Additional checks for special content
         if content_type == "weekly":
-            return time_match and now.weekday() == 0  # Monday only
-        elif content_type == "monthly":
-            return time_match and self.is_last_day_of_month()
-        elif content_type == "quarterly":
+            return self._refresh_day_facts(now)["weekday"] == 0  # Monday only
+        if content_type == "monthly":
+            return self._refresh_day_facts(now)["is_last_day_of_month"]
+        if content_type == "quarterly":
             # 1st day of quarter: Jan/Apr/Jul/Oct
-            return time_match and now.day == 1 and now.month in [1, 4, 7, 10]
-        elif content_type == "semestral":
+            return now.day == 1 and now.month in (1, 4, 7, 10)
+        if content_type == "semestral":
             # 1st day of semester: Jan/Jul
-            return time_match and now.day == 1 and now.month in [1, 7]
-        else:
-            # Market-aware daily content scheduling
-            if market_status == "CLOSED" and not self.is_weekend():
-                # During market closed hours, still generate content on weekdays
-                return time_match
-            elif self.is_weekend():
-                # Weekend - all daily content allowed (night, late_night, press_review, morning, noon, afternoon, evening, summary)
-                return time_match
-            else:
-                # Regular market days - all content allowed
-                return time_match
+            return now.day == 1 and now.month in (1, 7)
+
+        # Daily content (night, late_night, press_review, morning, noon,
+        # afternoon, evening, summary)
+        return True
 
-    def should_generate_content(self, content_type: str) -> bool:
+    def should_generate_content(self, content_type: str, now: Optional[datetime.datetime] = None) -> bool:
         """Check if content should be generated (time + not already sent for this period)."""
+        last_key = self._last_key.get(content_type)
+        if last_key is None:
+            return False
+
         # Reload flags to avoid stale in-memory state in long-running/multi-process setups
         try:
-            self.load_flags()
+            with self._with_file_lock(exclusive=False):
+                self.load_flags()
         except Exception:
             pass
 
-        now = _now_it()
+        if now is None:
+            now = _now_it()
         period_now = self._period_key(content_type, now)
-        last_key = f"{content_type}_last_sent_period"
         already_sent = (self.flags.get(last_key, "") == period_now)
 
-        return self.is_time_for_content(content_type) and (not already_sent)
+        return self.is_time_for_content(content_type, now) and (not already_sent)
 
     def mark_content_sent(self, content_type: str):
         """Mark content as sent for the current period and save flags."""
-        # Reload first to incorporate other writers, then update
-        try:
-            self.load_flags()
-        except Exception:
-            pass
+        last_key = self._last_key.get(content_type)
+        if last_key is None:
+            log.warning(f"[SCHEDULER] Unknown content type, not marked: {content_type}")
+            return
+
+        # Reload first to incorporate other writers, then update (under lock so
+        # concurrent writers cannot clobber each other's marks)
+        with self._with_file_lock():
+            try:
+                self.load_flags()
+            except Exception:
+                pass
 
-        now = _now_it()
-        self.flags[f"{content_type}_last_sent_period"] = self._period_key(content_type, now)
-        self._sync_derived_sent_flags(now)
-        self.save_flags()
+            now = _now_it()
+            self.flags[last_key] = self._period_key(content_type, now)
+            self.save_flags()
+            self._update_all_sent_sentinel(now)
         log.info(f"âœ… {content_type} marked as sent")
 
     def _maybe_rollover_daily_flags(self) -> None:
         """Legacy rollover hook.
 
-        In schema v2 we never reset flags globally; we only keep last_reset_date
+        Since schema v2 we never reset flags globally; we only keep last_reset_date
         as an informational field.
         """
         try:
-            now = _now_it()
-            self.flags["last_reset_date"] = _today_key(now)
-            self._sync_derived_sent_flags(now)
+            self.flags["last_reset_date"] = _today_key(_now_it())
         except Exception as e:
             log.warning(f"[SCHEDULER] Rollover check failed: {e}")
 
     def get_pending_content(self) -> list:
-        """Get list of content types that need to be generated"""
+        """Get list of content types that need to be generated (in schedule-time order)"""
         self._maybe_rollover_daily_flags()
+        now = _now_it()
+        self._refresh_day_facts(now)
+        return self._pending_for(now)
+
+    def _flags_mtime_ns(self) -> Optional[int]:
+        """Modification time of the flags file (None if missing)."""
+        try:
+            return os.stat(self.flags_file).st_mtime_ns
+        except OSError:
+            return None
+
+    def _update_all_sent_sentinel(self, now: datetime.datetime) -> None:
+        """Arm the "nothing left today" short-circuit if all content due today is sent."""
+        # Content due at some point today = time check passes at end of day
+        end_of_day = now.replace(hour=23, minute=59, second=59, microsecond=0)
+        due_mask = 0
+        for ct, bit in self._flag_bit.items():
+            if self.is_time_for_content(ct, end_of_day):
+                due_mask |= bit
+
+        if self._sent_mask(now) & due_mask == due_mask:
+            next_midnight = (now + datetime.timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+            # Tied to the flags file version: a reset by another process re-arms checks
+            self._all_sent_until = (next_midnight, self._flags_mtime_ns())
+            log.info(f"[SCHEDULER] All content for today sent; idle until {next_midnight:%Y-%m-%d %H:%M}")
+        else:
+            self._all_sent_until = None
+
+    def _pending_for(self, now: datetime.datetime) -> list:
+        """Pending content for a given time snapshot."""
+        if self._all_sent_until is not None:
+            until, mtime_ns = self._all_sent_until
+            if now < until and self._flags_mtime_ns() == mtime_ns:
+                return []
+            self._all_sent_until = None
+
         pending = []
-        
-        for content_type in self.schedule.keys():
-            if self.should_generate_content(content_type):
+
+        # Slots scheduled later today cannot match yet: skip them entirely
+        cutoff = bisect_right(self._schedule_minutes, now.hour * 60 + now.minute)
+        for _, content_type in self._schedule_by_minute[:cutoff]:
+            if self.should_generate_content(content_type, now):
                 pending.append(content_type)
-        
+
         return pending
 
+    def seconds_until_next_event(self, now: Optional[datetime.datetime] = None) -> float:
+        """Seconds until the next scheduled slot or the midnight period rollover.
+
+        Lets a polling loop sleep until something can actually become due
+        instead of re-checking every few seconds.
+        """
+        if now is None:
+            now = _now_it()
+        now_sec = now.hour * 3600 + now.minute * 60 + now.second + now.microsecond / 1_000_000
+        day_sec = 24 * 3600
+
+        # Midnight: daily period keys roll over
+        next_delta = day_sec - now_sec
+        for minute in self._schedule_minutes:
+            delta = minute * 60 - now_sec
+            if delta <= 0:
+                delta += day_sec  # already passed today -> tomorrow
+            if delta < next_delta:
+                next_delta = delta
+        return next_delta
+
     def get_status(self) -> dict:
         """Get enhanced scheduler status with market intelligence"""
         self._maybe_rollover_daily_flags()
         now = _now_it()
+        day_facts = self._refresh_day_facts(now)
         market_intel = self.get_market_intelligence()
-        pending_content = self.get_pending_content()
+        # Same snapshot for pending, flags and priorities (pending reloads flags)
+        pending_content = self._pending_for(now)
+        content_priorities = {
+            content: self.get_content_priority(content, market_intel)
+            for content in self.schedule
+        }
         
         status = {
             "current_time": now.strftime("%H:%M:%S"),
             "current_date": now.strftime("%Y-%m-%d"),
             "day_of_week": now.strftime("%A"),
-            "is_weekend": self.is_weekend(),
-            "is_last_day_of_month": self.is_last_day_of_month(),
-            "is_high_priority_time": self.is_high_priority_time(),
+            "is_weekend": day_facts["is_weekend"],
+            "is_last_day_of_month": day_facts["is_last_day_of_month"],
+            "is_high_priority_time": self.is_high_priority_time(market_intel),
             "pending_content": pending_content,
-            "flags": self.flags.copy(),
+            # Plain dict (JSON-serializable); *_sent booleans are derived here, never persisted
+            "flags": {**self.flags, **self._derived_sent_flags(now)},
             "schedule": self.schedule.copy(),
             "market_intelligence": market_intel,
-            "content_priorities": {content: self.get_content_priority(content) for content in self.schedule.keys()}
+            "content_priorities": content_priorities,
         }
         
         return status
 
     def force_reset_flag(self, content_type: str):
         """Force reset a specific flag for testing."""
-        last_key = f"{content_type}_last_sent_period"
-        if last_key in self.flags:
+        last_key = self._last_key.get(content_type)
+        if last_key is None or last_key not in self.flags:
+            return False
+        with self._with_file_lock():
+            self.load_flags()
             self.flags[last_key] = ""
-            self._sync_derived_sent_flags(_now_it())
             self.save_flags()
-            log.info(f"ðŸ”„ Force reset flag: {content_type}")
-            return True
-        return False
+            self._all_sent_until = None
+        log.info(f"ðŸ”„ Force reset flag: {content_type}")
+        return True
 
     def force_reset_all_flags(self):
         """Force reset all flags for testing."""
-        for ct in self.schedule.keys():
-            self.flags[f"{ct}_last_sent_period"] = ""
-            self.flags[f"{ct}_sent"] = False
-        self.flags["last_reset_date"] = _today_key(_now_it())
-        self.save_flags()
+        with self._with_file_lock():
+            for ct in self.schedule.keys():
+                self.flags[self._last_key[ct]] = ""
+            self.flags["last_reset_date"] = _today_key(_now_it())
+            self.save_flags()
+            self._all_sent_until = None
         log.info("ðŸ”„ Force reset all content flags")
 
 # Singleton instance
 scheduler = None
+_scheduler_lock = threading.Lock()
+
+# get_status() helper cache: (monotonic time, flags file mtime, minute, status); cleared by the mutating helpers
+_status_cache = None
 
 def get_scheduler() -> SVScheduler:
-    """Get singleton scheduler instance"""
+    """Get singleton scheduler instance.
+
+    The lock is only taken while the instance is missing, so concurrent first
+    calls do not build two instances; setting ``scheduler = None`` resets it.
+    """
     global scheduler
     if scheduler is None:
-        scheduler = SVScheduler()
+        with _scheduler_lock:
+            if scheduler is None:
+                scheduler = SVScheduler()
     return scheduler
 
 # Helper functions
@@ -484,21 +751,58 @@ def is_time_for(content_type: str) -> bool:
 def mark_sent(content_type: str):
     """Quick mark content as sent"""
     get_scheduler().mark_content_sent(content_type)
+    _invalidate_status()
 
 def get_pending() -> list:
     """Quick get pending content"""
     return get_scheduler().get_pending_content()
 
 def get_status() -> dict:
-    """Quick get scheduler status"""
-    return get_scheduler().get_status()
+    """Quick get scheduler status.
+
+    Cached for ``_STATUS_TTL_SECONDS`` so the triggers polled in one tick
+    share a single snapshot. The snapshot is tied to the flags file version
+    (like _update_all_sent_sentinel): a mark written by any process, or by a
+    direct SVScheduler.mark_content_sent call, drops it. mark_sent/reset
+    helpers also invalidate it. It is also keyed on the current minute, the
+    resolution of the schedule, so pending_content and the date never lag
+    behind the clock; current_time is refreshed on every call. Callers get a
+    deep copy, nested dicts included.
+    """
+    global _status_cache
+    sched = get_scheduler()
+    mtime_ns = sched._flags_mtime_ns()
+    now_it = _now_it()
+    minute = now_it.strftime("%Y-%m-%d %H:%M")
+    cached = _status_cache
+    now = time.monotonic()
+    if (cached is not None and now - cached[0] < _STATUS_TTL_SECONDS
+            and cached[1] == mtime_ns and cached[2] == minute):
+        status = copy.deepcopy(cached[3])
+        status["current_time"] = now_it.strftime("%H:%M:%S")
+        return status
+    status = sched.get_status()
+    # mtime read before the snapshot: a write during get_status forces a rebuild
+    _status_cache = (now, mtime_ns, minute, status)
+    return copy.deepcopy(status)
+
+def _invalidate_status():
+    """Drop the cached get_status() snapshot"""
+    global _status_cache
+    _status_cache = None
+
+def seconds_until_next() -> float:
+    """Quick get seconds until the next scheduled event"""
+    return get_scheduler().seconds_until_next_event()
 
 def reset_flag(content_type: str):
     """Quick reset specific flag.
 
     Not used by the automated pipeline; kept for manual operations/tests.
     """
-    return get_scheduler().force_reset_flag(content_type)
+    result = get_scheduler().force_reset_flag(content_type)
+    _invalidate_status()
+    return result
 
 
 def reset_all_flags():
@@ -507,6 +811,8 @@ def reset_all_flags():
     Not used by the automated pipeline; kept for manual operations/tests.
     """
     get_scheduler().force_reset_all_flags()
+    _invalidate_status()
+
 # Test function
 def test_scheduler():
     """Test enhanced scheduler functionality with market intelligence"""
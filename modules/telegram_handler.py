@@ -6,13 +6,24 @@ Telegram message sending system for Content Creation Engine
 """
 
 import os
+import functools
+import hashlib
+import html
 import json
+import random
+import re
+import unicodedata
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import threading
 import time
+from collections import Counter
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 import logging
 from pathlib import Path
+from types import MappingProxyType
 
 # For proper emoji handling
 try:
@@ -30,10 +41,165 @@ except ImportError:
         EMOJI_MODULE = None
         print("[WARN] No emoji module available - emoji may be corrupted on Windows")
 
+# Streaming multipart upload (optional): without it requests builds the body in memory
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+# Fast JSON encoder (optional), stdlib json as fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 log = logging.getLogger(__name__)
 
+TELEGRAM_API_ROOT = "https://api.telegram.org"
+
+def _build_session(pool_maxsize: int) -> requests.Session:
+    """Crea una Session keep-alive con pool dedicato verso l'API Telegram"""
+    session = requests.Session()
+    # Retry a livello di trasporto solo per errori di connessione (richiesta non ancora
+    # inviata, sicuro anche per POST); 429/5xx restano gestiti da _retry_delay
+    transport_retry = Retry(total=3, connect=3, read=0, status=0, other=0, backoff_factor=0.5)
+    session.mount(TELEGRAM_API_ROOT, HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=transport_retry))
+    session.headers.update({'Connection': 'keep-alive'})
+    return session
+
+def _dumps_json(data: Any, pretty: bool = False) -> bytes:
+    """Serializza in UTF-8 (compatto, o indentato se pretty) con orjson se disponibile"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+class _TokenBucket:
+    """Rate limiter a token bucket: `rate` token/secondo, burst massimo `capacity`"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, n: float = 1) -> None:
+        """Preleva n token, attendendo il refill se necessario"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= n:
+                    self._tokens -= n
+                    return
+                wait = (n - self._tokens) / self.rate
+            time.sleep(wait)
+
+# Rate limit condivisi da tutte le istanze del processo, con margine sui limiti
+# Telegram (30 msg/s globali, 1 msg/s per chat, 20 msg/min per gruppo)
+_GLOBAL_BUCKET = _TokenBucket(rate=25, capacity=25)
+_CHAT_BUCKETS: Dict[str, List[_TokenBucket]] = {}
+_CHAT_BUCKETS_LOCK = threading.Lock()
+
+def _chat_buckets(chat_id) -> List[_TokenBucket]:
+    """Bucket per chat (1 msg/s) più, per gruppi/canali, il limite al minuto"""
+    key = str(chat_id)
+    with _CHAT_BUCKETS_LOCK:
+        buckets = _CHAT_BUCKETS.get(key)
+        if buckets is None:
+            buckets = [_TokenBucket(rate=1, capacity=1)]
+            # Chat id negativi = gruppi/canali
+            if key.startswith('-'):
+                buckets.append(_TokenBucket(rate=18 / 60, capacity=18))
+            _CHAT_BUCKETS[key] = buckets
+        return buckets
+
+# Caratteri da rimuovere prima dell'invio, in un'unica passata:
+# controlli C0/C1 (tranne \n e \t), formattazione invisibile (Cf, incl. zero-width),
+# surrogati e Private Use Area (BMP e supplementari A/B)
+_STRIP_RE = re.compile(
+    '[\x00-\x08\x0b-\x1f\x7f-\x9f\xad'
+    '\u0600-\u0605\u061c\u06dd\u070f\u0890\u0891\u08e2\u180e'
+    '\u200b-\u200f\u202a-\u202e\u2060-\u2064\u2066-\u206f'
+    '\ud800-\udfff\ue000-\uf8ff\ufeff\ufff9-\ufffb'
+    '\U000110bd\U000110cd\U00013430-\U0001343f\U0001bca0-\U0001bca3\U0001d173-\U0001d17a'
+    '\U000e0001\U000e0020-\U000e007f'
+    '\U000f0000-\U000ffffd\U00100000-\U0010fffd]'
+)
+
+# Markdown-style markers converted to HTML: **bold** and *italic* (single pass)
+_MD_RE = re.compile(r"\*\*(?P<b>.+?)\*\*|(?<!\*)\*(?!\*)(?P<i>.+?)\*(?!\*)")
+
+def _md_tag(match: re.Match) -> str:
+    """Replacement per _MD_RE: <b> per **...**, <i> per *...*"""
+    bold = match.group('b')
+    if bold is not None:
+        return f"<b>{bold}</b>"
+    return f"<i>{match.group('i')}</i>"
+
+def _to_html(text: str) -> str:
+    """Escape HTML, poi converte i marker bold (**...**) e italic (*...*) in una passata"""
+    return _MD_RE.sub(_md_tag, html.escape(text))
+
+_TAG_RE = re.compile(r"<(/?)([bi])>")
+
+def _truncate_html(text: str, limit: int) -> str:
+    """Tronca HTML (output di _to_html) entro `limit` caratteri senza spezzare
+    parole, entità o tag, e chiude i tag <b>/<i> rimasti aperti"""
+    if len(text) <= limit:
+        return text
+    # Tag ed entità non contengono spazi: tagliare sull'ultimo spazio è sempre sicuro
+    cut = text.rfind(' ', 0, limit)
+    if cut <= 0:
+        cut = limit
+        # Nessuno spazio: non lasciare a metà un tag (<...>) o un'entità (&...;)
+        for opener, closer in (('<', '>'), ('&', ';')):
+            start = text.rfind(opener, 0, cut)
+            if start != -1 and text.rfind(closer, start, cut) == -1:
+                cut = start
+    truncated = text[:cut].rstrip()
+    open_tags = []
+    for closing, tag in _TAG_RE.findall(truncated):
+        if not closing:
+            open_tags.append(tag)
+        elif open_tags and open_tags[-1] == tag:
+            open_tags.pop()
+    return truncated + ''.join(f"</{tag}>" for tag in reversed(open_tags))
+
+# Keyword per le ML features dei messaggi salvati
+_SENTIMENT_WORDS = {
+    'bullish': ('bullish', 'positive', 'strong'),
+    'bearish': ('bearish', 'negative', 'weak'),
+    'neutral': ('neutral', 'stable', 'balanced')
+}
+_PREDICTION_KEYWORDS = ('prediction', 'forecast', 'expect', 'likely', 'target', 'resistance', 'support')
+_MARKET_TERMS = ('s&p', 'nasdaq', 'bitcoin', 'btc', 'eur/usd', 'gold', 'vix', 'fed', 'ecb')
+_CONFIDENCE_WORDS = {
+    'high': ('certain', 'confident', 'strong', 'clear', 'definite'),
+    'medium': ('likely', 'probable', 'expect', 'should', 'normal'),
+    'low': ('uncertain', 'unclear', 'mixed', 'volatile', 'unpredictable')
+}
+_REFERENCE_WORDS = ('news', 'market', 'ml', 'model')
+
+def _build_keyword_re() -> re.Pattern:
+    """Alternanza unica di tutte le keyword (inizio parola, le più lunghe prima)"""
+    words = set(_PREDICTION_KEYWORDS) | set(_MARKET_TERMS) | set(_REFERENCE_WORDS)
+    for group in (_SENTIMENT_WORDS, _CONFIDENCE_WORDS):
+        for group_words in group.values():
+            words.update(group_words)
+    alternation = '|'.join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+    return re.compile(rf"\b(?:{alternation})")
+
+_KEYWORD_RE = _build_keyword_re()
+
 def load_private_config(config_file: str = 'config/private.txt') -> Dict[str, str]:
     """
     Carica configurazione privata da file di testo
@@ -44,34 +210,113 @@ def load_private_config(config_file: str = 'config/private.txt') -> Dict[str, st
     Returns:
         Dict con configurazioni caricate
     """
-    config = {}
-    
     # Cerca il file nella directory del progetto
     project_root = Path(__file__).resolve().parent.parent
     config_path = os.path.join(project_root, config_file)
     
     try:
-        if os.path.exists(config_path):
-            with open(config_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    # Ignora commenti e righe vuote
-                    if line and not line.startswith('#'):
-                        if '=' in line:
-                            key, value = line.split('=', 1)
-                            config[key.strip()] = value.strip()
-            
-            log.info(f"[OK] [CONFIG] Loaded private config from {config_file}")
-        else:
-            log.warning(f"[WARN] [CONFIG] Private config file not found: {config_path}")
-            log.warning(f"[WARN] [CONFIG] Using default placeholder values")
+        mtime_ns = os.stat(config_path).st_mtime_ns
+    except FileNotFoundError:
+        log.warning(f"[WARN] [CONFIG] Private config file not found: {config_path}")
+        log.warning(f"[WARN] [CONFIG] Using default placeholder values")
+        return {}
+    except Exception as e:
+        log.error(f"[ERR] [CONFIG] Error loading private config: {e}")
+        return {}
+    
+    # Copia: i chiamanti possono modificare il dict senza toccare la cache
+    return dict(_load_private_config_cached(config_path, mtime_ns))
+
+@functools.lru_cache(maxsize=8)
+def _load_private_config_cached(config_path: str, mtime_ns: int) -> Dict[str, str]:
+    """Parsing di private.txt, memorizzato per (path, mtime): un file modificato viene riletto"""
+    config = {}
+    
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                # Ignora commenti e righe vuote
+                if line and not line.startswith('#'):
+                    if '=' in line:
+                        key, value = line.split('=', 1)
+                        config[key.strip()] = value.strip()
+        
+        log.info(f"[OK] [CONFIG] Loaded private config from {config_path}")
     
     except Exception as e:
         log.error(f"[ERR] [CONFIG] Error loading private config: {e}")
     
     return config
 
+
+def _press_review_features(content: str, counts: Counter) -> Dict:
+    """Feature specifiche della rassegna stampa"""
+    return {
+        'sections_count': content.count('•'),  # Bullet points
+        'news_references': counts['news'] + counts['market']
+    }
+
+
+def _forecast_features(content: str, counts: Counter) -> Dict:
+    """Feature specifiche dei report con previsioni (morning/noon/evening)"""
+    return {
+        'prediction_count': content.count('%') + content.count('target') + content.count('level'),
+        'ml_references': counts['ml'] + counts['model']
+    }
+
+
+# Content type -> estrattore di feature aggiuntive
+_TYPE_FEATURES = MappingProxyType({
+    'press_review': _press_review_features,
+    'morning': _forecast_features,
+    'noon': _forecast_features,
+    'evening': _forecast_features
+})
+
+
 class TelegramHandler:
+    # Text-based tags to avoid emoji problems
+    content_emojis = MappingProxyType({
+        'night': '[NIGHT]',
+        'late_night': '[LATE]',
+        'press_review': '[PR]',
+        'morning': '[AM]',
+        'noon': '[NOON]',
+        'afternoon': '[AFT]',
+        'evening': '[PM]',
+        'summary': '[SUM]',
+        'weekly': '[WEEKLY]',
+        'monthly': '[MONTHLY]',
+        'quarterly': '[QUARTERLY]',
+        'semestral': '[SEMI]',
+        'semiannual': '[SEMI]',
+        'annual': '[ANNUAL]',
+        'document': '[DOC]',
+        'error': '[ERR]',
+        'success': '[OK]',
+        'warning': '[WARN]'
+    })
+
+    # Nomi leggibili per l'header dei messaggi
+    _CONTENT_DISPLAY = MappingProxyType({
+        'night': 'Night Report',
+        'late_night': 'Late Night Update',
+        'press_review': 'Press Review',
+        'morning': 'Morning Report',
+        'noon': 'Noon Update',
+        'afternoon': 'Afternoon Update',
+        'evening': 'Evening Analysis',
+        'summary': 'Daily Summary',
+        'weekly': 'Weekly Report',
+        'monthly': 'Monthly Report',
+        'quarterly': 'Quarterly Report',
+        'semestral': 'Semestral Report',
+        'semiannual': 'Semiannual Report',
+        'annual': 'Annual Report',
+        'document': 'Document'
+    })
+
     def __init__(self, bot_token: str = None, chat_id: str = None):
         """
         Inizializza handler Telegram
@@ -80,23 +325,18 @@ class TelegramHandler:
             bot_token: Token del bot Telegram
             chat_id: ID della chat di destinazione
         """
-        # Carica configurazione privata
-        private_config = load_private_config()
-        
-        # Configurazione da parametri, private.txt, o environment variables
-        self.bot_token = (
-            bot_token or 
-            private_config.get('TELEGRAM_BOT_TOKEN') or 
-            self._get_config_value('TELEGRAM_BOT_TOKEN', 'YOUR_BOT_TOKEN_HERE')
-        )
-        self.chat_id = (
-            chat_id or 
-            private_config.get('TELEGRAM_CHAT_ID') or 
-            self._get_config_value('TELEGRAM_CHAT_ID', 'YOUR_CHAT_ID_HERE')
-        )
-        
-        # Base URL API Telegram
-        self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
+        # Token/chat risolti e directory storico create al primo invio (_ensure_initialized):
+        # chi importa il modulo senza inviare non tocca il disco
+        self.bot_token = bot_token
+        self.chat_id = chat_id
+        self.base_url = None
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+        # Connessioni HTTPS riutilizzate: una session per i messaggi testuali,
+        # una separata per gli upload multipart così da non bloccare i testi
+        self._session = _build_session(pool_maxsize=4)
+        self._upload_session = _build_session(pool_maxsize=1)
         
         # Configurazione SV-specifica
         self.sv_config = {
@@ -105,38 +345,84 @@ class TelegramHandler:
             'retry_delay': 5,  # secondi
             'enable_preview': False,  # Disabilita preview link per default
             'parse_mode': 'HTML',  # Enable HTML formatting for bold/italic
-            'timeout': 10  # timeout richieste
+            'timeout': 10,  # timeout richieste
+            'history_pretty_json': False  # debug: storico messaggi indentato
         }
 
-        if self.bot_token == 'YOUR_BOT_TOKEN_HERE' or self.chat_id == 'YOUR_CHAT_ID_HERE':
-            log.warning("[WARN] [TELEGRAM] Missing bot token or chat id - messages will not be delivered until configured")
-        
-        # Text-based tags to avoid emoji problems
-        self.content_emojis = {
-            'night': '[NIGHT]',
-            'late_night': '[LATE]',
-            'press_review': '[PR]',
-            'morning': '[AM]',
-            'noon': '[NOON]',
-            'afternoon': '[AFT]',
-            'evening': '[PM]',
-            'summary': '[SUM]',
-            'weekly': '[WEEKLY]',
-            'monthly': '[MONTHLY]',
-            'quarterly': '[QUARTERLY]',
-            'semestral': '[SEMI]',
-            'semiannual': '[SEMI]',
-            'annual': '[ANNUAL]',
-            'document': '[DOC]',
-            'error': '[ERR]',
-            'success': '[OK]',
-            'warning': '[WARN]'
-        }
-        
         # Setup message history for ML analysis and coherence
         project_root = Path(__file__).parent.parent
         self.message_history_dir = project_root / 'reports' / '9_telegram_history'
-        self.message_history_dir.mkdir(parents=True, exist_ok=True)
+
+        # Contatori sequenza giornalieri per (data, content_type), inizializzati dal disco al primo uso
+        self._seq_counts: Dict[tuple, int] = {}
+        self._seq_lock = threading.Lock()
+
+        # Messaggi già salvati oggi: (data, content_type, blake2b del contenuto) -> path
+        self._saved_hashes: Dict[tuple, str] = {}
+    
+    def _ensure_initialized(self) -> None:
+        """Carica la configurazione privata e prepara la directory storico (una sola volta)"""
+        if self._initialized:
+            return
+        with self._init_lock:
+            if self._initialized:
+                return
+            
+            # Carica configurazione privata
+            private_config = load_private_config()
+            
+            # Configurazione da parametri, private.txt, o environment variables
+            self.bot_token = (
+                self.bot_token or 
+                private_config.get('TELEGRAM_BOT_TOKEN') or 
+                self._get_config_value('TELEGRAM_BOT_TOKEN', 'YOUR_BOT_TOKEN_HERE')
+            )
+            self.chat_id = (
+                self.chat_id or 
+                private_config.get('TELEGRAM_CHAT_ID') or 
+                self._get_config_value('TELEGRAM_CHAT_ID', 'YOUR_CHAT_ID_HERE')
+            )
+            
+            # Base URL API Telegram
+            self.base_url = f"{TELEGRAM_API_ROOT}/bot{self.bot_token}"
+            
+            if self.bot_token == 'YOUR_BOT_TOKEN_HERE' or self.chat_id == 'YOUR_CHAT_ID_HERE':
+                log.warning("[WARN] [TELEGRAM] Missing bot token or chat id - messages will not be delivered until configured")
+            
+            self.message_history_dir.mkdir(parents=True, exist_ok=True)
+            self._initialized = True
+    
+    def _throttle(self, chat_id) -> None:
+        """Attende i token necessari (globale + chat) prima di una chiamata di invio"""
+        _GLOBAL_BUCKET.consume()
+        for bucket in _chat_buckets(chat_id):
+            bucket.consume()
+    
+    def _retry_delay(self, response, attempt: int) -> Optional[float]:
+        """Secondi da attendere prima di ritentare una risposta HTTP non-200, None se non va ritentata.
+        - 429: rispetta parameters.retry_after indicato da Telegram (+ jitter)
+        - 5xx: backoff esponenziale retry_delay * 2**attempt
+        - altri 4xx: errore definitivo
+        """
+        status = response.status_code
+        if status == 429:
+            try:
+                retry_after = float(response.json().get('parameters', {}).get('retry_after', 1))
+            except (ValueError, AttributeError):
+                retry_after = 1.0
+            # Jitter: invii concorrenti non ripartono tutti nello stesso istante
+            return retry_after + random.uniform(0, 0.5)
+        if status >= 500:
+            return self.sv_config['retry_delay'] * (2 ** attempt)
+        return None
+
+    def _api_error(self, response) -> str:
+        """Descrizione errore dalla risposta Telegram (fallback: status + body)"""
+        try:
+            description = response.json().get('description')
+        except (ValueError, AttributeError):
+            description = None
+        return description or f"HTTP {response.status_code} - {response.text}"
     
     def _get_config_value(self, env_var: str, default: str) -> str:
         """Ottieni valore da environment variable o usa default"""
@@ -157,10 +443,10 @@ class TelegramHandler:
         elif not isinstance(text, str):
             text = str(text)
 
-        # Unicode normalization
+        # Unicode normalization (quick check first: ASCII and already-NFKC text is left as is)
         try:
-            import unicodedata
-            text = unicodedata.normalize('NFKC', text)
+            if not text.isascii() and not unicodedata.is_normalized('NFKC', text):
+                text = unicodedata.normalize('NFKC', text)
         except Exception:
             pass
         
@@ -176,107 +462,77 @@ class TelegramHandler:
             except Exception:
                 pass  # Continue with original text if emoji processing fails
         
-        # Strip Private Use Area characters (BMP U+E000–U+F8FF)
-        text = ''.join(ch for ch in text if not (0xE000 <= ord(ch) <= 0xF8FF))
-        # Strip Supplementary Private Use Area-A/B (U+F0000–U+FFFFD, U+100000–U+10FFFD)
-        text = ''.join(ch for ch in text if not (0xF0000 <= ord(ch) <= 0x10FFFD and (ord(ch) <= 0xFFFFD or ord(ch) >= 0x100000)))
-        
-        # Remove zero-width and formatting controls
-        ZW_CHARS = {
-            '\u200B',  # ZERO WIDTH SPACE
-            '\u200C',  # ZERO WIDTH NON-JOINER
-            '\u200D',  # ZERO WIDTH JOINER
-            '\u200E',  # LEFT-TO-RIGHT MARK
-            '\u200F',  # RIGHT-TO-LEFT MARK
-            '\u2060',  # WORD JOINER
-            '\uFEFF',  # ZERO WIDTH NO-BREAK SPACE
-        }
-        text = ''.join(ch for ch in text if ch not in ZW_CHARS)
-        
-        # Remove other non-printable control characters (keep newline and tab)
-        try:
-            text = ''.join(ch for ch in text if ch in ('\n', '\t') or (31 < ord(ch) < 0x110000 and (not unicodedata.category(ch).startswith('C'))))
-        except Exception:
-            pass
+        # Strip Private Use Area, zero-width/formatting and control chars (keep newline and tab)
+        text = _STRIP_RE.sub('', text)
         
         # Light cleanup (do not strip asterisks — used for markup conversion)
         clean_text = text.replace('```', '`')
         
         return clean_text.strip()
 
-    def _format_sv_message(self, content_type: str, content: str, metadata: Dict = None) -> str:
+    def _build_header(self, content_type: str, safe_content: str, metadata: Dict = None,
+                      timestamp: str = '00:00') -> str:
+        """Header SV del messaggio (plain text), vuoto se il contenuto ha già il proprio header SV"""
+        # Detect if content already has its own SV header within the first lines
+        if 'SV - ' in safe_content[:200]:
+            return ''
+
+        emoji = self.content_emojis.get(content_type, '[SV]')
+        content_display = self._CONTENT_DISPLAY.get(content_type) or content_type.title()
+
+        # Invariant: header built only from ASCII literals, the tag/display maps and
+        # strftime, so it needs no sanitization; caller-supplied metadata values
+        # are the only external text and are sanitized individually
+        header = f"{emoji} SV - {content_display} [{timestamp}]\n"
+        if metadata:
+            if 'market_status' in metadata:
+                header += f"Market: {self._sanitize_text(metadata['market_status'])}\n"
+            if 'day_context' in metadata:
+                header += f"Context: {self._sanitize_text(metadata['day_context'])}\n"
+        header += "-" * 35 + "\n\n"
+        return header
+
+    def _content_budget(self, html_header: str) -> int:
+        """Caratteri HTML disponibili per il contenuto prima del troncamento"""
+        return self.sv_config['max_message_length'] - len(html_header) - 50
+
+    def fits_in_message(self, content: str, content_type: str = 'generic', metadata: Dict = None) -> bool:
+        """True se _format_sv_message non troncherebbe content (sanitize + HTML reali, stesso budget)"""
+        safe_content = self._sanitize_text(content)
+        html_header = _to_html(self._build_header(content_type, safe_content, metadata))
+        return len(_to_html(safe_content)) <= self._content_budget(html_header)
+
+    def _format_sv_message(self, content_type: str, content: str, metadata: Dict = None,
+                           now: datetime = None) -> str:
         """
         Format message for Telegram delivery. If the content already contains an SV header,
         avoid adding an extra bot header to prevent duplication and artifacts.
         Applies HTML formatting for bold/italic converted from * and ** markers.
         """
-        timestamp = datetime.now().strftime('%H:%M')
+        timestamp = (now or datetime.now()).strftime('%H:%M')
 
         # Light sanitization first (used both for detection and final build)
         safe_content = self._sanitize_text(content)
 
-        # Detect if content already has its own SV header within the first lines
-        has_own_header = ('SV - ' in safe_content[:200])
-
-        safe_header = ''
-        if not has_own_header:
-            emoji = self.content_emojis.get(content_type, '[SV]')
-            content_display = {
-                'night': 'Night Report',
-                'late_night': 'Late Night Update',
-                'press_review': 'Press Review',
-                'morning': 'Morning Report',
-                'noon': 'Noon Update',
-                'afternoon': 'Afternoon Update',
-                'evening': 'Evening Analysis',
-                'summary': 'Daily Summary',
-                'weekly': 'Weekly Report',
-                'monthly': 'Monthly Report',
-                'quarterly': 'Quarterly Report',
-                'semestral': 'Semestral Report',
-                'semiannual': 'Semiannual Report',
-                'annual': 'Annual Report',
-                'document': 'Document',
-                'generic': content_type.title()
-            }.get(content_type, content_type.title())
-
-            header = f"{emoji} SV - {content_display} [{timestamp}]\n"
-            if metadata:
-                if 'market_status' in metadata:
-                    header += f"Market: {metadata['market_status']}\n"
-                if 'day_context' in metadata:
-                    header += f"Context: {metadata['day_context']}\n"
-            header += "-" * 35 + "\n\n"
-            safe_header = self._sanitize_text(header)
-
         # Convert simple markdown-style markers to HTML (<b>, <i>) and escape safely
-        def _to_html(text: str) -> str:
-            import re, html
-            # Convert bold (**...**)
-            text = re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", text)
-            # Convert italic (*...*) avoiding double-asterisk cases
-            text = re.sub(r"(?<!\*)\*(?!\*)(.+?)\*(?!\*)", r"<i>\1</i>", text)
-            # Escape everything, then allow our minimal HTML tags
-            escaped = html.escape(text)
-            for tag in ["b", "i"]:
-                escaped = escaped.replace(f"&lt;{tag}&gt;", f"<{tag}>")
-                escaped = escaped.replace(f"&lt;/{tag}&gt;", f"</{tag}>")
-            return escaped
-
-        full_message = (_to_html(safe_header) + _to_html(safe_content)).strip()
+        html_header = _to_html(self._build_header(content_type, safe_content, metadata, timestamp))
+        html_content = _to_html(safe_content)
+        full_message = (html_header + html_content).strip()
         
-        # Verifica lunghezza e tronca se necessario
+        # Verifica lunghezza e tronca se necessario (markup HTML mantenuto valido)
         if len(full_message) > self.sv_config['max_message_length']:
-            max_content_length = self.sv_config['max_message_length'] - len(safe_header) - 50
-            truncated_content = safe_content[:max_content_length] + "\n\n[message truncated - continues...]"
-            full_message = safe_header + truncated_content
+            max_content_length = self._content_budget(html_header)
+            truncated_content = _truncate_html(html_content, max_content_length) + "\n\n[message truncated - continues...]"
+            full_message = (html_header + truncated_content).strip()
         
         return full_message
     
     def save_message_for_analysis(self, content: str, content_type: str, 
                                  metadata: Dict = None, telegram_result: Dict = None):
         """Save sent message for ML analysis and coherence tracking"""
+        dedup_key = None
         try:
+            self._ensure_initialized()
             now = datetime.now()
             date_str = now.strftime('%Y-%m-%d')
             time_str = now.strftime('%H%M%S')
@@ -285,6 +541,20 @@ class TelegramHandler:
             filename = f"{date_str}_{time_str}_{content_type}.json"
             filepath = self.message_history_dir / filename
             
+            # Skip identical content already saved today (retries, re-sent batches)
+            digest = hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+            dedup_key = (date_str, content_type, digest)
+            with self._seq_lock:
+                saved_path = self._saved_hashes.get(dedup_key)
+                if saved_path is None:
+                    # Nuovo giorno: scarta gli hash dei giorni precedenti
+                    for old_key in [k for k in self._saved_hashes if k[0] != date_str]:
+                        del self._saved_hashes[old_key]
+                    self._saved_hashes[dedup_key] = str(filepath)
+            if saved_path is not None:
+                log.info(f"[SAVE] [HISTORY] {content_type} message already saved today: {Path(saved_path).name}")
+                return saved_path
+            
             # Prepare message data for ML analysis
             message_data = {
                 'timestamp': now.isoformat(),
@@ -300,78 +570,79 @@ class TelegramHandler:
                 'ml_features': self._extract_ml_features(content, content_type)
             }
             
-            # Save to JSON
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(message_data, f, ensure_ascii=False, indent=2)
+            # Save to JSON (compatto, scrittura atomica tmp + replace)
+            serialized = _dumps_json(message_data, pretty=self.sv_config.get('history_pretty_json', False))
+            tmp_path = filepath.with_suffix('.json.tmp')
+            tmp_path.write_bytes(serialized)
+            os.replace(tmp_path, filepath)
             
             log.info(f"[SAVE] [HISTORY] {content_type} message saved for ML analysis: {filename}")
             return str(filepath)
             
         except Exception as e:
             log.error(f"[ERR] [HISTORY] Error saving message history: {e}")
+            if dedup_key is not None:
+                with self._seq_lock:
+                    self._saved_hashes.pop(dedup_key, None)
             return None
     
     def _get_daily_sequence_number(self, date_str: str, content_type: str) -> int:
         """Get sequence number for this content type today (for coherence analysis)"""
-        try:
-            # Count existing files for this content type today
-            pattern = f"{date_str}_*_{content_type}.json"
-            existing_files = list(self.message_history_dir.glob(pattern))
-            return len(existing_files) + 1
-        except Exception:
-            return 1
+        key = (date_str, content_type)
+        with self._seq_lock:
+            count = self._seq_counts.get(key)
+            if count is None:
+                # Nuovo giorno: scarta i contatori dei giorni precedenti
+                for old_key in [k for k in self._seq_counts if k[0] != date_str]:
+                    del self._seq_counts[old_key]
+                try:
+                    # Count existing files for this content type today (once per day/type)
+                    pattern = f"{date_str}_*_{content_type}.json"
+                    count = sum(1 for _ in self.message_history_dir.glob(pattern))
+                except Exception:
+                    count = 0
+            # Riserva il numero: invii concorrenti non ottengono lo stesso valore
+            self._seq_counts[key] = count + 1
+            return count + 1
     
     def _extract_ml_features(self, content: str, content_type: str) -> Dict:
-        """Extract ML features from message content"""
+        """Extract ML features from message content (single keyword scan)"""
+        counts = Counter(_KEYWORD_RE.findall(content.lower()))
         features = {
-            'sentiment_indicators': self._count_sentiment_words(content),
-            'prediction_keywords': self._count_prediction_keywords(content),
-            'market_terms': self._count_market_terms(content),
-            'confidence_level': self._estimate_confidence_level(content),
+            'sentiment_indicators': self._count_sentiment_words(counts),
+            'prediction_keywords': self._count_prediction_keywords(counts),
+            'market_terms': self._count_market_terms(counts),
+            'confidence_level': self._estimate_confidence_level(counts),
             'coherence_score': 0.0  # Will be calculated by comparing to previous messages
         }
         
-        # Content-type specific features
-        if content_type == 'press_review':
-            features['sections_count'] = content.count('•')  # Bullet points
-            features['news_references'] = content.lower().count('news') + content.lower().count('market')
-        elif content_type in ['morning', 'noon', 'evening']:
-            features['prediction_count'] = content.count('%') + content.count('target') + content.count('level')
-            features['ml_references'] = content.lower().count('ml') + content.lower().count('model')
+        # Content-type specific features (one dict probe per message)
+        extra = _TYPE_FEATURES.get(content_type)
+        if extra is not None:
+            features.update(extra(content, counts))
         
         return features
     
-    def _count_sentiment_words(self, text: str) -> Dict[str, int]:
+    def _count_sentiment_words(self, counts: Counter) -> Dict[str, int]:
         """Count sentiment indicator words"""
-        text_lower = text.lower()
         return {
-            'bullish': text_lower.count('bullish') + text_lower.count('positive') + text_lower.count('strong'),
-            'bearish': text_lower.count('bearish') + text_lower.count('negative') + text_lower.count('weak'),
-            'neutral': text_lower.count('neutral') + text_lower.count('stable') + text_lower.count('balanced')
+            bucket: sum(counts[word] for word in words)
+            for bucket, words in _SENTIMENT_WORDS.items()
         }
     
-    def _count_prediction_keywords(self, text: str) -> int:
+    def _count_prediction_keywords(self, counts: Counter) -> int:
         """Count prediction-related keywords"""
-        keywords = ['prediction', 'forecast', 'expect', 'likely', 'target', 'resistance', 'support']
-        return sum(text.lower().count(keyword) for keyword in keywords)
+        return sum(counts[keyword] for keyword in _PREDICTION_KEYWORDS)
     
-    def _count_market_terms(self, text: str) -> int:
+    def _count_market_terms(self, counts: Counter) -> int:
         """Count market-specific terms"""
-        terms = ['s&p', 'nasdaq', 'bitcoin', 'btc', 'eur/usd', 'gold', 'vix', 'fed', 'ecb']
-        return sum(text.lower().count(term) for term in terms)
+        return sum(counts[term] for term in _MARKET_TERMS)
     
-    def _estimate_confidence_level(self, text: str) -> float:
+    def _estimate_confidence_level(self, counts: Counter) -> float:
         """Estimate confidence level from text indicators"""
-        confidence_indicators = {
-            'high': ['certain', 'confident', 'strong', 'clear', 'definite'],
-            'medium': ['likely', 'probable', 'expect', 'should', 'normal'],
-            'low': ['uncertain', 'unclear', 'mixed', 'volatile', 'unpredictable']
-        }
-        
-        text_lower = text.lower()
-        high_count = sum(text_lower.count(word) for word in confidence_indicators['high'])
-        medium_count = sum(text_lower.count(word) for word in confidence_indicators['medium'])
-        low_count = sum(text_lower.count(word) for word in confidence_indicators['low'])
+        high_count = sum(counts[word] for word in _CONFIDENCE_WORDS['high'])
+        medium_count = sum(counts[word] for word in _CONFIDENCE_WORDS['medium'])
+        low_count = sum(counts[word] for word in _CONFIDENCE_WORDS['low'])
         
         total = high_count + medium_count + low_count
         if total == 0:
@@ -393,9 +664,14 @@ class TelegramHandler:
         Returns:
             Dict con risultato sending
         """
+        # Un solo timestamp per header, log e risultato dello stesso invio
+        now = datetime.now()
+        ts = now.isoformat()
         try:
+            self._ensure_initialized()
+            
             # Format message per SV
-            formatted_message = self._format_sv_message(content_type, content, metadata)
+            formatted_message = self._format_sv_message(content_type, content, metadata, now)
             
             # Parametri richiesta
             base_payload = {
@@ -413,7 +689,8 @@ class TelegramHandler:
                 """Helper per inviare un payload e restituire il risultato."""
                 for attempt in range(self.sv_config['retry_attempts']):
                     try:
-                        response = requests.post(
+                        self._throttle(payload['chat_id'])
+                        response = self._session.post(
                             f"{self.base_url}/sendMessage",
                             json=payload,
                             timeout=self.sv_config['timeout']
@@ -431,7 +708,7 @@ class TelegramHandler:
                                     'success': True,
                                     'message_id': result['result']['message_id'],
                                     'content_type': content_type,
-                                    'timestamp': datetime.now().isoformat()
+                                    'timestamp': ts
                                 }
 
                             description = result.get('description') or 'Unknown API error'
@@ -439,6 +716,11 @@ class TelegramHandler:
                             return {'success': False, 'error': description}
 
                         log.error(f"❌ [TELEGRAM] HTTP Error: {response.status_code} - {response.text}")
+                        delay = self._retry_delay(response, attempt)
+                        if delay is None:
+                            return {'success': False, 'error': self._api_error(response)}
+                        if attempt < self.sv_config['retry_attempts'] - 1:
+                            time.sleep(delay)
 
                     except requests.exceptions.RequestException as e:
                         log.error(f"❌ [TELEGRAM] Network Error (attempt {attempt + 1}): {e}")
@@ -451,7 +733,7 @@ class TelegramHandler:
                     'success': False,
                     'error': 'Failed after all retry attempts',
                     'content_type': content_type,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': ts
                 }
 
             # Primo tentativo: usa parse_mode se configurato
@@ -476,7 +758,7 @@ class TelegramHandler:
                 'success': False,
                 'error': str(e),
                 'content_type': content_type,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': ts
             }
     
     def send_sv_content_batch(self, content_list: List[Dict]) -> List[Dict]:
@@ -496,10 +778,8 @@ class TelegramHandler:
             content_type = content_item.get('type') or content_item.get('content_type', 'generic')
             metadata = content_item.get('metadata', {})
             
-            # Delay tra messaggi per evitare rate limiting
-            if i > 0:
-                time.sleep(2)
-            
+            # Tutti nella stessa chat: in sequenza per mantenere l'ordine di consegna,
+            # il ritmo (1 msg/s) è quello dei token bucket in send_message
             result = self.send_message(content, content_type, metadata)
             results.append(result)
             
@@ -525,9 +805,10 @@ class TelegramHandler:
         Returns:
             Dict with sending result
         """
+        now = datetime.now()
+        ts = now.isoformat()
         try:
-            import os
-            from pathlib import Path
+            self._ensure_initialized()
             
             # Check if file exists
             if not os.path.exists(file_path):
@@ -554,7 +835,7 @@ class TelegramHandler:
             # Format caption with SV branding
             if caption:
                 emoji = self.content_emojis.get(content_type, '[DOC]')
-                timestamp = datetime.now().strftime('%H:%M')
+                timestamp = now.strftime('%H:%M')
                 formatted_caption = f"{emoji} SV - {caption} [{timestamp}]"
             else:
                 formatted_caption = None
@@ -572,12 +853,26 @@ class TelegramHandler:
                         if formatted_caption:
                             data['caption'] = formatted_caption
                         
-                        response = requests.post(
-                            f"{self.base_url}/sendDocument",
-                            files=files,
-                            data=data,
-                            timeout=30  # Longer timeout for file uploads
-                        )
+                        self._throttle(self.chat_id)
+                        if MultipartEncoder is not None:
+                            # Body letto dal disco a blocchi durante l'upload
+                            encoder = MultipartEncoder(fields={
+                                **{key: str(value) for key, value in data.items()},
+                                **files
+                            })
+                            response = self._upload_session.post(
+                                f"{self.base_url}/sendDocument",
+                                data=encoder,
+                                headers={'Content-Type': encoder.content_type},
+                                timeout=30  # Longer timeout for file uploads
+                            )
+                        else:
+                            response = self._upload_session.post(
+                                f"{self.base_url}/sendDocument",
+                                files=files,
+                                data=data,
+                                timeout=30  # Longer timeout for file uploads
+                            )
                     
                     if response.status_code == 200:
                         result = response.json()
@@ -605,12 +900,22 @@ class TelegramHandler:
                                 'content_type': content_type,
                                 'filename': filename,
                                 'file_size': file_size,
-                                'timestamp': datetime.now().isoformat()
+                                'timestamp': ts
                             }
                         else:
                             log.error(f"❌ [TELEGRAM] API Error: {result.get('description')}")
                     else:
                         log.error(f"❌ [TELEGRAM] HTTP Error: {response.status_code}")
+                        delay = self._retry_delay(response, attempt)
+                        if delay is None:
+                            return {
+                                'success': False,
+                                'error': self._api_error(response),
+                                'content_type': content_type,
+                                'timestamp': ts
+                            }
+                        if attempt < self.sv_config['retry_attempts'] - 1:
+                            time.sleep(delay)
                 
                 except requests.exceptions.RequestException as e:
                     log.error(f"❌ [TELEGRAM] Network Error (attempt {attempt + 1}): {e}")
@@ -624,7 +929,7 @@ class TelegramHandler:
                 'success': False,
                 'error': 'Failed after all retry attempts',
                 'content_type': content_type,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': ts
             }
             
         except Exception as e:
@@ -633,7 +938,7 @@ class TelegramHandler:
                 'success': False,
                 'error': str(e),
                 'content_type': content_type,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': ts
             }
     
     def send_daily_summary(self, summary_data: Dict) -> Dict:
@@ -649,6 +954,8 @@ class TelegramHandler:
             Risultato sending
         """
         try:
+            self._ensure_initialized()
+            
             # Costruisci summary Formatto
             content = "**DAILY SUMMARY COMPLETO**\n\n"
             # Sezione performance
@@ -685,7 +992,8 @@ class TelegramHandler:
     def test_connection(self) -> bool:
         """Test connessione Telegram bot"""
         try:
-            response = requests.get(f"{self.base_url}/getMe", timeout=5)
+            self._ensure_initialized()
+            response = self._session.get(f"{self.base_url}/getMe", timeout=5)
             if response.status_code == 200:
                 result = response.json()
                 if result.get('ok'):
@@ -700,6 +1008,11 @@ class TelegramHandler:
             log.error(f"❌ [TELEGRAM] Connection test error: {e}")
             return False
 
+# Parti fisse dei messaggi di servizio (send_sv_error / send_sv_success)
+_ERR_HEADER = "**ERRORE SISTEMA SV**\n\n"
+_ERR_FOOTER = "\n\n⚠️ *Verificare sistema e log*"
+_OK_HEADER = "**OPERAZIONE COMPLETATA**\n\n✅ "
+
 # Singleton instance per SV
 telegram_handler = None
 
@@ -732,13 +1045,8 @@ def send_sv_error(error_message: str, context: str = '') -> Dict:
     Helper legacy/non-critico: non è richiamato dal core engine, ma utile
     per script operativi e test manuali.
     """
-    content = f"**ERRORE SISTEMA SV**\n\n"
-    if context:
-        content += f"Contesto: `{context}`\n"
-    content += f"Errore: `{error_message}`\n\n"
-    content += f"⚠️ *Verificare sistema e log*"
-    
-    return send_sv_message(content, 'error')
+    context_line = f"Contesto: `{context}`\n" if context else ""
+    return send_sv_message(f"{_ERR_HEADER}{context_line}Errore: `{error_message}`{_ERR_FOOTER}", 'error')
 
 def send_sv_success(message: str, details: str = '') -> Dict:
     """Send message di successo SV.
@@ -746,44 +1054,5 @@ def send_sv_success(message: str, details: str = '') -> Dict:
     Helper legacy/non-critico: non è richiamato dal core engine, ma utile
     per script operativi e test manuali.
     """
-    content = f"**OPERAZIONE COMPLETATA**\n\n"
-    content += f"✅ {message}\n"
-    if details:
-        content += f"\nDettagli: `{details}`"
-    
-    return send_sv_message(content, 'success')
-
-# Test function
-def test_telegram_integration():
-    """Test completo integrazione Telegram per SV"""
-    print("ðŸ§ª [TEST] Testing Telegram Integration...")
-    
-    handler = get_telegram_handler()
-    
-    # Test 1: Connessione
-    if not handler.test_connection():
-        print("âŒ [TEST] Connection failed")
-        return False
-    
-    # Test 2: message singolo
-    test_result = handler.send_message(
-        "Test message from SV Content Engine", 
-        'morning',
-        {'market_status': 'OPEN', 'day_context': 'Tuesday Test'}
-    )
-    
-    if test_result['success']:
-        print("âœ… [TEST] Single message sent successfully")
-    else:
-        print("âŒ [TEST] Single message failed")
-        return False
-    
-    print("âœ… [TEST] Telegram integration working correctly")
-    return True
-
-if __name__ == '__main__':
-    test_telegram_integration()
-
-
-
-
+    details_part = f"\n\nDettagli: `{details}`" if details else ""
+    return send_sv_message(f"{_OK_HEADER}{message}{details_part}", 'success')
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SV - Trigger All
+Esegue tutti gli slot giornalieri in un unico processo (import e connessioni condivisi)
+"""
+
+import sys
+import logging
+
+# Add project root to Python path (once per process, no duplicates)
+import _bootstrap  # noqa: F401  (sets sys.path)
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+log = logging.getLogger(__name__)
+
+def main():
+    """Run every daily slot; each one sends only when the scheduler says it is time"""
+    from trigger_common import SLOTS, run_slot
+
+    all_success = True
+    for slot in SLOTS:
+        if not run_slot(slot):
+            all_success = False
+    return all_success
+
+if __name__ == '__main__':
+    success = main()
+    sys.exit(0 if success else 1)
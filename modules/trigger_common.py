@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SV - Trigger Common
+Helper condivisi dai trigger_* per l'invio dei messaggi generati
+"""
+
+import logging
+import sys
+from datetime import datetime
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
+log = logging.getLogger(__name__)
+
+# Slot giornalieri: nome -> funzione di daily_generator che produce i messaggi
+SLOTS: Dict[str, str] = {
+    'night': 'generate_night',
+    'late_night': 'generate_late_night',
+    'press_review': 'generate_press_review_wrapper',
+    'morning': 'generate_morning',
+    'noon': 'generate_noon',
+    'afternoon': 'generate_afternoon',
+    'evening': 'generate_evening',
+    'summary': 'generate_summary'
+}
+
+# Content type interni per slot (stesse istanze stringa in tutti gli invii)
+_CTYPES: Dict[str, str] = {
+    name: sys.intern(name)
+    for name in (*SLOTS, 'weekly', 'monthly')
+}
+
+# Etichetta ed emoji per l'output dei trigger
+_SLOT_LABELS: Dict[str, tuple] = {
+    'night': ('Night report', '🌙'),
+    'late_night': ('Late night update', '🌙'),
+    'press_review': ('Press review', '📰'),
+    'morning': ('Morning report', '🌅'),
+    'noon': ('Noon update', '🌞'),
+    'afternoon': ('Afternoon update', '🌤'),
+    'evening': ('Evening analysis', '🌆'),
+    'summary': ('Daily summary', '📊')
+}
+
+# Slot i cui messaggi (sezioni/pagine) vengono accorpati nel minor numero di invii
+_PACKED_SLOTS = frozenset({'press_review', 'evening', 'summary'})
+_PACK_SEPARATOR = "\n\n---\n\n"
+
+
+def _pack_messages(messages: List[str], fits: Callable[[str], bool]) -> List[str]:
+    """Accorpa messaggi adiacenti finché `fits` (lunghezza reale dopo la formattazione
+    del TelegramHandler) accetta il risultato.
+    Non unisce messaggi con blocchi ``` aperti per non spezzarne i confini."""
+    packed: List[str] = []
+    for msg in messages:
+        if packed:
+            prev = packed[-1]
+            candidate = prev + _PACK_SEPARATOR + msg
+            if (prev.count('```') % 2 == 0 and msg.count('```') % 2 == 0
+                    and fits(candidate)):
+                packed[-1] = candidate
+                continue
+        packed.append(msg)
+    return packed
+
+
+def send_messages(telegram, messages: List[str], content_type: str) -> List[Dict]:
+    """Invia i messaggi in sequenza; risultati nello stesso ordine di messages.
+    Vanno tutti nella stessa chat (1 msg/s nel token bucket del TelegramHandler):
+    inviarli in parallelo non aumenta il ritmo e ne rimescola l'ordine di consegna."""
+    results: List[Dict] = []
+    for msg in messages:
+        try:
+            results.append(telegram.send_message(msg, content_type=content_type))
+        except Exception as e:
+            results.append({'success': False, 'error': str(e), 'content_type': content_type})
+    return results
+
+
+def run_slot(name: str, generator: Optional[Callable[[], List[str]]] = None, emoji: str = '') -> bool:
+    """
+    Esegue un trigger giornaliero: verifica scheduler, genera, invia, marca come inviato
+    
+    Args:
+        name: Nome dello slot (chiave di SLOTS)
+        generator: Funzione che restituisce i messaggi (default: quella registrata in SLOTS)
+        emoji: Emoji del banner (default: quella dello slot)
+    
+    Returns:
+        bool: True se esecuzione successful (anche se non è ancora l'orario), False otherwise
+    """
+    # Output bufferizzato: una write su stdout per fase (prima di generazione
+    # e invio, che sono le fasi lente) e una a fine esecuzione
+    lines: List[str] = []
+
+    def flush() -> None:
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
+            lines.clear()
+
+    try:
+        return _run_slot(name, generator, emoji, lines.append, flush)
+    finally:
+        flush()
+
+
+def _run_slot(name: str, generator: Optional[Callable[[], List[str]]], emoji: str,
+              emit: Callable[[str], None], flush: Callable[[], None]) -> bool:
+    """Corpo di run_slot; `emit` raccoglie le righe di output, `flush` le scrive"""
+    label, default_emoji = _SLOT_LABELS.get(name, (name.replace('_', ' ').title(), ''))
+    emit(f"{emoji or default_emoji} SV - TRIGGER {label.upper()}")
+    emit("=" * 50)
+    
+    try:
+        # Scheduler is cheap and needed on every path; generators and the
+        # telegram handler are imported only when the slot actually runs
+        from sv_scheduler import ITALY_TZ, is_time_for, mark_sent, get_pending
+        
+        now = datetime.now(ITALY_TZ)
+        emit(f"🕐 Current time: {now.strftime('%H:%M:%S')}")
+        emit(f"📅 Date: {now.strftime('%Y-%m-%d')} ({now.strftime('%A')})")
+        
+        # Check scheduler first: the full status snapshot is not needed on any path
+        if is_time_for(name):
+            emit(f"✅ Time for {label.lower()} - generating content...")
+            
+            from telegram_handler import get_telegram_handler
+            if generator is None:
+                import daily_generator
+                generator = getattr(daily_generator, SLOTS[name])
+            
+            # Shared telegram handler (one session/connection pool per process)
+            telegram = get_telegram_handler()
+            
+            flush()
+            messages = generator()
+            
+            if messages:
+                content_type = _CTYPES.get(name, name)
+                emit(f"📝 Generated {len(messages)} {label.lower()} message(s)")
+                if name in _PACKED_SLOTS and len(messages) > 1:
+                    messages = _pack_messages(messages, partial(telegram.fits_in_message, content_type=content_type))
+                    emit(f"📦 Packed into {len(messages)} Telegram message(s)")
+                
+                # Send to Telegram in order: the pages of summary, evening and press
+                # review share one chat paced at 1 msg/s, a worker pool would not help
+                flush()
+                results = send_messages(telegram, messages, content_type)
+                all_success = True
+                for i, result in enumerate(results, 1):
+                    if result.get('success'):
+                        emit(f"✅ {label} message {i}/{len(messages)} sent")
+                    else:
+                        emit(f"❌ {label} message {i}/{len(messages)} failed")
+                        all_success = False
+                
+                if all_success:
+                    # Mark as sent
+                    mark_sent(name)
+                    emit(f"✅ {label} sent successfully and marked as complete")
+                else:
+                    emit(f"❌ Failed to send some {label.lower()} messages to Telegram")
+                    return False
+            else:
+                emit(f"❌ Failed to generate {label.lower()} content")
+                return False
+        else:
+            emit(f"⏰ Not time for {label.lower()} yet")
+            if name in get_pending():
+                emit(f"📋 {label} is in pending queue")
+            else:
+                emit(f"📋 {label} not scheduled or already sent")
+        
+        return True
+        
+    except ImportError as e:
+        emit(f"❌ Missing dependencies: {e}")
+        return False
+    except Exception as e:
+        log.error(f"❌ Error in {name} trigger: {e}")
+        emit(f"❌ {label} trigger failed: {e}")
+        return False
@@ -5,16 +5,11 @@ SV - Trigger Monthly
 Gestisce l'avvio automatico dei report mensili
 """
 
-from pathlib import Path
 import sys
-import os
 import logging
-from datetime import datetime
 
-# Add project root to path
-project_root = Path(__file__).resolve().parent.parent
-sys.path.append(str(project_root))
-sys.path.append(str(project_root / 'config' / 'modules'))
+# Add project root to Python path (once per process, no duplicates)
+import _bootstrap  # noqa: F401  (sets sys.path)
 
 # Setup logging
 log = logging.getLogger(__name__)
@@ -4,14 +4,11 @@
 Script individuale per generare Night Report (00:00)
 """
 
-from pathlib import Path
 import sys
 import logging
 
-# Add project root to Python path
-project_root = Path(__file__).resolve().parent.parent
-sys.path.append(str(project_root))
-sys.path.append(str(project_root / 'config' / 'modules'))
+# Add project root to Python path (once per process, no duplicates)
+import _bootstrap  # noqa: F401  (sets sys.path)
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -20,62 +17,8 @@ log = logging.getLogger(__name__)
 
 def main():
     """Main function for night report trigger"""
-    print("🌙 SV - TRIGGER NIGHT REPORT")
-    print("=" * 50)
-
-    try:
-        from sv_scheduler import is_time_for, mark_sent, get_status
-        from daily_generator import generate_night
-        from telegram_handler import TelegramHandler
-
-        status = get_status()
-        print(f"🕐 Current time: {status['current_time']}")
-        print(f"📅 Date: {status['current_date']} ({status['day_of_week']})")
-
-        if is_time_for('night'):
-            print("✅ Time for night report - generating content...")
-
-            telegram = TelegramHandler()
-            messages = generate_night()
-
-            if messages:
-                print(f"📝 Generated {len(messages)} night message(s)")
-
-                all_success = True
-                for i, msg in enumerate(messages, 1):
-                    result = telegram.send_message(msg, content_type="night")
-                    if result.get('success'):
-                        print(f"✅ Night message {i}/{len(messages)} sent")
-                    else:
-                        print(f"❌ Night message {i}/{len(messages)} failed")
-                        all_success = False
-
-                if all_success:
-                    mark_sent('night')
-                    print("✅ Night report sent successfully and marked as complete")
-                else:
-                    print("❌ Failed to send some night messages to Telegram")
-                    return False
-            else:
-                print("❌ Failed to generate night content")
-                return False
-        else:
-            print("⏰ Not time for night report yet")
-            pending = status.get('pending_content', [])
-            if 'night' in pending:
-                print("📋 Night report is in pending queue")
-            else:
-                print("📋 Night report not scheduled or already sent")
-
-        return True
-
-    except ImportError as e:
-        print(f"❌ Missing dependencies: {e}")
-        return False
-    except Exception as e:
-        log.error(f"❌ Error in night trigger: {e}")
-        print(f"❌ Night trigger failed: {e}")
-        return False
+    from trigger_common import run_slot
+    return run_slot('night')
 
 
 if __name__ == '__main__':
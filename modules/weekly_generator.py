@@ -5,20 +5,36 @@ SV - Weekly Report Generatetor
 Generate report settimanali completi per weekend analysis
 """
 
+import copy
 import datetime
 import pytz
 import json
 import os
+import re
 import sys
 from typing import Dict, List, Optional, Any
 import logging
 from pathlib import Path
-import glob
+from collections import Counter, defaultdict
+from dataclasses import dataclass, asdict, field
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from operator import itemgetter
 
-# Add project root to Python path
-project_root = Path(__file__).resolve().parent.parent
-sys.path.append(str(project_root))
-sys.path.append(str(project_root / 'config' / 'modules'))
+# Fast JSON parsing (optional)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Streaming JSON parser (optional, used for large engine_{date}.json files)
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Add project root and config/modules to Python path (SV_ROOT-aware, shared with the triggers)
+from _bootstrap import project_root
 
 # Setup logging
 log = logging.getLogger(__name__)
@@ -54,6 +70,12 @@ except Exception as e:
  
 ITALY_TZ = pytz.timezone("Europe/Rome")
 
+# Parole chiave per gli eventi di mercato nei journal
+_EVENT_KWS = ('fed', 'earnings', 'volatility', 'breakout', 'trend')
+_LINE_KWS = ('fed', 'earnings', 'volatility')
+# Intere righe che contengono una delle _LINE_KWS
+_LINE_RE = re.compile(r'^[^\n]*(?:' + '|'.join(_LINE_KWS) + r')[^\n]*$', re.IGNORECASE | re.MULTILINE)
+
 def _now_it():
     """Get current time in Italian timezone"""
     return datetime.datetime.now(ITALY_TZ)
@@ -79,6 +101,17 @@ except Exception as e:
     def calculate_crypto_support_resistance(price, change_pct):
         return {}
 
+# Telegram handler condiviso (import e creazione al primo invio)
+_telegram_handler = None
+
+def _get_telegram():
+    """Cached telegram handler for PDF sends"""
+    global _telegram_handler
+    if _telegram_handler is None:
+        from telegram_handler import get_telegram_handler
+        _telegram_handler = get_telegram_handler()
+    return _telegram_handler
+
 def get_week_dates():
     """Get current week start and end dates"""
     now = _now_it()
@@ -89,16 +122,111 @@ def get_week_dates():
     
     return monday.strftime('%d/%m'), friday.strftime('%d/%m')
 
+def _load_json(path):
+    """Parse a JSON file with orjson when available, stdlib json otherwise"""
+    raw = Path(path).read_bytes()
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN/Infinity written by json.dump: let stdlib decide
+    return json.loads(raw.decode('utf-8'))
+
+@lru_cache(maxsize=256)
+def _cached_json(path, mtime_ns, size):
+    """Parsed JSON per (path, mtime, size): a changed file gets a new key.
+    The returned object is shared between calls, callers must not modify it."""
+    return _load_json(path)
+
+def _week_stats(days):
+    """Best, worst and most active day plus accuracy delta (last - first) in one pass.
+    `days` is a non-empty list with numeric 'accuracy_val'; the first day wins on ties."""
+    best = worst = most_active = days[0]
+    for d in days[1:]:
+        acc = d['accuracy_val']
+        if acc > best['accuracy_val']:
+            best = d
+        if acc < worst['accuracy_val']:
+            worst = d
+        if d.get('signals', 0) > most_active.get('signals', 0):
+            most_active = d
+    return best, worst, most_active, days[-1]['accuracy_val'] - days[0]['accuracy_val']
+
+@lru_cache(maxsize=32)
+def _date_labels(start, end):
+    """(date, 'YYYY-MM-DD', 'Weekday dd/mm') for each day from start to end inclusive"""
+    days = (start + datetime.timedelta(days=i) for i in range((end - start).days + 1))
+    return tuple((d, d.isoformat(), d.strftime('%A %d/%m')) for d in days)
+
+def _asset_accuracies(asset_performance, min_total=2):
+    """(asset, predictions, accuracy %) for assets with at least min_total predictions; unparsable entries skipped"""
+    for asset, info in asset_performance.items():
+        try:
+            total = int(info.get('total_predictions', 0) or 0)
+            acc = float(str(info.get('accuracy', '0%')).replace('%', ''))
+        except Exception:
+            continue
+        if total >= min_total:
+            yield asset, total, acc
+
+# Weekly data già assemblati: (lunedì, firma dei file di input) -> weekly_data
+_WEEKLY_CACHE: Dict[tuple, Dict[str, Any]] = {}
+_WEEKLY_CACHE_MAX = 8
+
+@lru_cache(maxsize=64)
+def _cached_summary_stage(path, mtime_ns, size):
+    """'summary' stage of an engine_{date}.json (None if absent).
+    With ijson the file is parsed only up to that stage."""
+    if ijson is not None:
+        with open(path, 'rb') as f:
+            for st in ijson.items(f, 'stages.item', use_float=True):
+                if isinstance(st, dict) and st.get('stage') == 'summary':
+                    return st
+        return None
+    for st in _load_json(path).get('stages', []) or []:
+        if st.get('stage') == 'summary':
+            return st
+    return None
+
+def _read_json(path, parser=_cached_json):
+    """Read a JSON file; returns (path, data) with data None if missing or unreadable"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return path, None
+    try:
+        return path, parser(path, st.st_mtime_ns, st.st_size)
+    except Exception as e:
+        log.warning(f"[ASSEMBLER] Error loading {path}: {e}")
+        return path, None
+
+def _read_text(path):
+    """Read a UTF-8 text file; returns (path, content) with content None on error"""
+    try:
+        return path, Path(path).read_text(encoding='utf-8')
+    except Exception as e:
+        log.warning(f"[ASSEMBLER] Error loading journal {path}: {e}")
+        return path, None
+
 class WeeklyDataAssembler:
     """Aggregates real data from daily JSON files for weekly reports"""
     
     def __init__(self):
-        self.project_root = Path(__file__).resolve().parent.parent
+        self.project_root = project_root
         self.daily_metrics_dir = os.path.join(self.project_root, 'reports', 'metrics')
         self.journals_dir = os.path.join(self.project_root, 'reports', 'journals')
         self.messages_dir = os.path.join(self.project_root, 'reports', '1_daily')
         self.predictions_dir = os.path.join(self.project_root, 'reports', '1_daily')
         self.engine_metrics_dir = os.path.join(self.project_root, 'reports', 'metrics')
+        # Prefissi dei file giornalieri (path + '{date}.json' senza os.path.join per giorno)
+        self._daily_prefix = os.path.join(self.daily_metrics_dir, 'daily_metrics_')
+        self._pred_prefix = os.path.join(self.predictions_dir, 'predictions_')
+        self._engine_prefix = os.path.join(self.engine_metrics_dir, 'engine_')
+        self._news_prefix = os.path.join(self.daily_metrics_dir, 'seen_news_')
+    
+    def _build_dates(self, start, end):
+        """Dates of the range with their ISO string and day label, computed once per range"""
+        return _date_labels(start, end)
     
     def get_weekly_date_range(self, target_date=None):
         """Get date range for current week (Monday to Friday)"""
@@ -111,76 +239,113 @@ class WeeklyDataAssembler:
         
         return monday.date(), friday.date()
     
-    def load_daily_metrics(self, date_range):
-        """Load daily metrics JSONs for the date range"""
+    def load_daily_metrics(self, date_range, executor=None):
+        """Load daily metrics JSONs for the date range (file reads on `executor` if given)"""
         monday, friday = date_range
         daily_data = {}
         
-        # Generate dates from Monday to Friday
-        current_date = monday
-        while current_date <= friday:
-            date_str = current_date.strftime('%Y-%m-%d')
-            metrics_file = os.path.join(self.daily_metrics_dir, f'daily_metrics_{date_str}.json')
-            
-            if os.path.exists(metrics_file):
-                try:
-                    with open(metrics_file, 'r', encoding='utf-8') as f:
-                        daily_data[date_str] = json.load(f)
+        # Generate dates from Monday to Friday, read all files in parallel
+        date_strs = [date_str for _, date_str, _ in self._build_dates(monday, friday)]
+        paths = [f'{self._daily_prefix}{date_str}.json' for date_str in date_strs]
+        
+        debug = log.isEnabledFor(logging.DEBUG)  # no f-string per day when debug is off
+        mapper = executor.map if executor is not None else map
+        for date_str, (_, data) in zip(date_strs, mapper(_read_json, paths)):
+            if data is not None:
+                daily_data[date_str] = data
+                if debug:
                     log.debug(f"[ASSEMBLER] Loaded metrics for {date_str}")
-                except Exception as e:
-                    log.warning(f"[ASSEMBLER] Error loading {metrics_file}: {e}")
-            
-            current_date += datetime.timedelta(days=1)
         
         return daily_data
     
-    def load_weekly_journals(self, date_range):
-        """Load journal entries for the week"""
+    def _journal_index(self):
+        """One directory scan: trading_journal_{date}*.md paths bucketed by date"""
+        prefix = 'trading_journal_'
+        start = len(prefix)
+        by_date = defaultdict(list)
+        try:
+            with os.scandir(self.journals_dir) as it:
+                for e in it:
+                    if e.name.startswith(prefix) and e.name.endswith('.md'):
+                        by_date[e.name[start:start + 10]].append(e.path)
+        except OSError as e:
+            log.debug(f"[ASSEMBLER] Journals directory not readable: {e}")
+        return by_date
+    
+    def _input_signature(self, date_range, now=None):
+        """(path, mtime_ns, size) of every existing input file of the week (stat only, no reads)"""
+        monday, friday = date_range
+        news_end = min(friday + datetime.timedelta(days=2), (now or _now_it()).date())
+        paths = []
+        for _, date_str, _ in self._build_dates(monday, friday):
+            paths.append(f'{self._daily_prefix}{date_str}.json')
+            paths.append(f'{self._pred_prefix}{date_str}.json')
+            paths.append(f'{self._engine_prefix}{date_str}.json')
+        for _, date_str, _ in self._build_dates(monday, news_end):
+            paths.append(f'{self._news_prefix}{date_str}.json')
+        by_date = self._journal_index()
+        for _, date_str, _ in self._build_dates(monday, friday):
+            paths.extend(sorted(by_date.get(date_str, ())))
+        
+        signature = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            signature.append((path, st.st_mtime_ns, st.st_size))
+        return tuple(signature)
+    
+    def load_weekly_journals(self, date_range, executor=None):
+        """Load journal entries for the week (file reads on `executor` if given)"""
         monday, friday = date_range
         journal_entries = []
+        by_date = self._journal_index()
         
-        current_date = monday
-        while current_date <= friday:
-            date_str = current_date.strftime('%Y-%m-%d')
-            journal_pattern = os.path.join(self.journals_dir, f'trading_journal_{date_str}*.md')
-            
-            matching_files = glob.glob(journal_pattern)
-            for journal_file in matching_files:
-                try:
-                    with open(journal_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        journal_entries.append({
-                            'date': date_str,
-                            'content': content,
-                            'file': os.path.basename(journal_file)
-                        })
-                except Exception as e:
-                    log.warning(f"[ASSEMBLER] Error loading journal {journal_file}: {e}")
-            
-            current_date += datetime.timedelta(days=1)
+        # (date, file) in week order, then read all journals in parallel
+        candidates = []
+        for _, date_str, _ in self._build_dates(monday, friday):
+            candidates.extend((date_str, journal_file) for journal_file in by_date.get(date_str, ()))
+        
+        mapper = executor.map if executor is not None else map
+        results = mapper(_read_text, [journal_file for _, journal_file in candidates])
+        for (date_str, journal_file), (_, content) in zip(candidates, results):
+            if content is not None:
+                journal_entries.append({
+                    'date': date_str,
+                    'content': content,
+                    'file': os.path.basename(journal_file)
+                })
         
         return journal_entries
     
-    def load_weekly_signals(self, date_range):
-        """Load per-day signals (asset/direction) and outcomes when available"""
+    def load_weekly_signals(self, date_range, executor=None):
+        """Load per-day signals (asset/direction) and outcomes when available
+        (file reads on `executor` if given)"""
         monday, friday = date_range
-        current_date = monday
         weekly_signals: List[Dict[str, Any]] = []
         
-        while current_date <= friday:
-            date_str = current_date.strftime('%Y-%m-%d')
+        dates = self._build_dates(monday, friday)
+        date_strs = [date_str for _, date_str, _ in dates]
+        # Predictions and engine files for the whole week, read in parallel
+        mapper = executor.map if executor is not None else map
+        pred_results = mapper(_read_json, [
+            f'{self._pred_prefix}{date_str}.json' for date_str in date_strs
+        ])
+        engine_results = mapper(partial(_read_json, parser=_cached_summary_stage), [
+            f'{self._engine_prefix}{date_str}.json' for date_str in date_strs
+        ])
+        
+        for (_, date_str, day_label), (_, pdata), (_, summary_stage) in zip(dates, pred_results, engine_results):
             day_entry: Dict[str, Any] = {
-                'day': current_date.strftime('%A %d/%m'),
+                'day': day_label,
                 'date': date_str,
                 'signals': []
             }
             # Base signals from predictions file
-            pred_path = os.path.join(self.predictions_dir, f'predictions_{date_str}.json')
             base_signals: List[Dict[str, Any]] = []
-            if os.path.exists(pred_path):
+            if pdata is not None:
                 try:
-                    with open(pred_path, 'r', encoding='utf-8') as f:
-                        pdata = json.load(f)
                     for item in pdata.get('predictions', []) or []:
                         if not isinstance(item, dict):
                             continue
@@ -197,33 +362,25 @@ class WeeklyDataAssembler:
             
             # Outcomes from engine summary prediction_eval (if available)
             eval_items: List[Dict[str, Any]] = []
-            engine_path = os.path.join(self.engine_metrics_dir, f'engine_{date_str}.json')
-            if os.path.exists(engine_path):
+            if summary_stage is not None:
                 try:
-                    with open(engine_path, 'r', encoding='utf-8') as f:
-                        edata = json.load(f)
-                    for st in edata.get('stages', []) or []:
-                        if st.get('stage') == 'summary':
-                            pe = st.get('prediction_eval') or {}
-                            items = pe.get('items') or []
-                            if isinstance(items, list):
-                                eval_items = [i for i in items if isinstance(i, dict)]
-                            break
+                    pe = summary_stage.get('prediction_eval') or {}
+                    items = pe.get('items') or []
+                    if isinstance(items, list):
+                        eval_items = [i for i in items if isinstance(i, dict)]
                 except Exception as e:
                     log.warning(f"[ASSEMBLER] Error loading engine metrics for {date_str}: {e}")
             
-            # Match outcomes by asset+direction
+            # Match outcomes by asset+direction (first eval item wins)
             if eval_items and base_signals:
+                ev_index: Dict[tuple, str] = {}
+                for ev in eval_items:
+                    ev_index.setdefault((ev.get('asset'), ev.get('direction')), ev.get('status') or 'N/A')
                 for sig in base_signals:
-                    for ev in eval_items:
-                        if sig.get('asset') == ev.get('asset') and sig.get('direction') == ev.get('direction'):
-                            status = ev.get('status') or 'N/A'
-                            sig['outcome'] = status
-                            break
+                    sig['outcome'] = ev_index.get((sig.get('asset'), sig.get('direction')), 'N/A')
             
             day_entry['signals'] = base_signals
             weekly_signals.append(day_entry)
-            current_date += datetime.timedelta(days=1)
         
         return weekly_signals
     
@@ -232,16 +389,19 @@ class WeeklyDataAssembler:
         total_predictions = 0
         successful_predictions = 0
         daily_performances = []
+        append = daily_performances.append
+        fromisoformat = datetime.date.fromisoformat  # C fast path, no format parsing
         
         for date_str, data in daily_data.items():
             day_info = {
-                'day': datetime.datetime.strptime(date_str, '%Y-%m-%d').strftime('%A %d/%m'),
+                'day': fromisoformat(date_str).strftime('%A %d/%m'),
                 'date': date_str
             }
             
             # Extract metrics if available
             if isinstance(data, dict):
-                predictions = data.get('predictions', {})
+                data_get = data.get
+                predictions = data_get('predictions', {})
                 if isinstance(predictions, dict):
                     day_total = predictions.get('total_tracked', 0) or 0
                     day_hits = predictions.get('hits', 0) or 0
@@ -249,28 +409,31 @@ class WeeklyDataAssembler:
                     total_predictions += int(day_total)
                     successful_predictions += int(day_hits)
                     
-                    day_info.update({
-                        'signals': day_total,
-                        'hits': day_hits,
-                        'success_rate': f"{(day_hits/day_total*100):.0f}%" if day_total > 0 else 'n/a'
-                    })
+                    day_info['signals'] = day_total
+                    day_info['hits'] = day_hits
+                    if day_total > 0:
+                        accuracy = day_hits / day_total * 100
+                        day_info['success_rate'] = f"{accuracy:.0f}%"
+                        # Numeric form of success_rate (same rounding) for downstream comparisons
+                        day_info['accuracy_val'] = float(round(accuracy))
+                    else:
+                        day_info['success_rate'] = 'n/a'
+                        day_info['accuracy_val'] = None
                 else:
-                    day_info.update({
-                        'signals': 0,
-                        'hits': 0,
-                        'success_rate': 'n/a'
-                    })
+                    day_info['signals'] = 0
+                    day_info['hits'] = 0
+                    day_info['success_rate'] = 'n/a'
+                    day_info['accuracy_val'] = None
                 
                 # Add market summary if available
-                market_summary = data.get('market_summary', '')
+                market_summary = data_get('market_summary', '')
                 if market_summary:
                     # Take first sentence as day notes
-                    notes = market_summary.split('.')[0][:100] + '...' if len(market_summary) > 100 else market_summary
-                    day_info['notes'] = notes
+                    day_info['notes'] = market_summary.split('.')[0][:100] + '...' if len(market_summary) > 100 else market_summary
                 else:
                     day_info['notes'] = 'No market summary available'
             
-            daily_performances.append(day_info)
+            append(day_info)
         
         overall_accuracy = (successful_predictions / total_predictions * 100) if total_predictions > 0 else 0
         
@@ -281,43 +444,43 @@ class WeeklyDataAssembler:
             'daily_performances': daily_performances
         }
     
-    def load_weekly_news(self, date_range):
-        """Load top news titles from seen_news_YYYY-MM-DD.json in metrics directory"""
+    def load_weekly_news(self, date_range, now=None, executor=None):
+        """Load top news titles from seen_news_YYYY-MM-DD.json in metrics directory
+        (file reads on `executor` if given)"""
         monday, friday = date_range
-        # Extend range slightly to include weekend headlines if present
-        end_date = min(friday + datetime.timedelta(days=2), _now_it().date())
-        current_date = monday
-        titles_seen = []
+        # Extend range slightly to include weekend headlines if present (never past today)
+        end_date = min(friday + datetime.timedelta(days=2), (now or _now_it()).date())
+        titles_seen = set()
         news_items = []
-        while current_date <= end_date:
-            date_str = current_date.strftime('%Y-%m-%d')
-            news_path = os.path.join(self.daily_metrics_dir, f'seen_news_{date_str}.json')
-            if os.path.exists(news_path):
+        date_strs = [date_str for _, date_str, _ in self._build_dates(monday, end_date)]
+        mapper = executor.map if executor is not None else map
+        results = mapper(_read_json, [
+            f'{self._news_prefix}{date_str}.json' for date_str in date_strs
+        ])
+        for date_str, (_, data) in zip(date_strs, results):
+            if data is not None:
                 try:
-                    with open(news_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
                     titles = data.get('titles', []) or []
                     links = data.get('links', []) or []
+                    nlinks = len(links)
                     for idx, t in enumerate(titles):
+                        if len(news_items) >= 12:
+                            break
                         if not isinstance(t, str):
                             continue
                         if t in titles_seen:
                             continue
-                        titles_seen.append(t)
-                        link = links[idx] if idx < len(links) else ''
+                        titles_seen.add(t)
                         # keep it short for PDF
                         news_items.append({
                             'date': date_str,
-                            'title': t[:140] + ('…' if len(t) > 140 else ''),
-                            'link': link
+                            'title': t if len(t) <= 140 else t[:140] + '…',
+                            'link': links[idx] if idx < nlinks else ''
                         })
-                        if len(news_items) >= 12:
-                            break
                 except Exception as e:
                     log.warning(f"[ASSEMBLER] Error loading weekly news for {date_str}: {e}")
             if len(news_items) >= 12:
                 break
-            current_date += datetime.timedelta(days=1)
         return news_items
 
     def extract_market_insights(self, daily_data, journal_entries):
@@ -339,16 +502,17 @@ class WeeklyDataAssembler:
         # Extract from journal entries
         for entry in journal_entries:
             content = entry['content']
+            low = content.casefold()  # once per entry
             # Look for market events or significant notes
-            if any(keyword in content.lower() for keyword in ['fed', 'earnings', 'volatility', 'breakout', 'trend']):
-                # Extract relevant sections
-                lines = content.split('\n')
-                relevant_lines = [line for line in lines if any(keyword in line.lower() for keyword in ['fed', 'earnings', 'volatility'])]
+            if any(keyword in low for keyword in _EVENT_KWS):
+                # Extract relevant sections (matching lines only, no full split)
+                relevant_lines = _LINE_RE.findall(content)
                 if relevant_lines:
+                    joined = ' '.join(relevant_lines)
                     market_events.append({
                         'date': entry['date'],
-                        'description': ' '.join(relevant_lines[:2])[:150] + '...' if len(' '.join(relevant_lines)) > 150 else ' '.join(relevant_lines),
-                        'impact': 'High' if 'volatility' in content.lower() else 'Medium'
+                        'description': ' '.join(relevant_lines[:2])[:150] + '...' if len(joined) > 150 else joined,
+                        'impact': 'High' if 'volatility' in low else 'Medium'
                     })
         
         return {
@@ -359,16 +523,32 @@ class WeeklyDataAssembler:
     def assemble_weekly_data(self, target_date=None):
         """Main method to assemble comprehensive weekly data"""
         try:
-            date_range = self.get_weekly_date_range(target_date)
+            # One clock read per assembly
+            now = _now_it()
+            date_range = self.get_weekly_date_range(now if target_date is None else target_date)
             monday, friday = date_range
             
+            # Same week and unchanged input files: reuse the previous assembly
+            cache_key = (monday.isoformat(), self._input_signature(date_range, now))
+            cached = _WEEKLY_CACHE.get(cache_key)
+            if cached is not None:
+                log.info(f"[ASSEMBLER] Inputs unchanged for week {monday} to {friday}, using cached data")
+                return copy.deepcopy(cached)
+            
             log.info(f"[ASSEMBLER] Assembling data for week {monday} to {friday}")
             
-            # Load all data sources
-            daily_data = self.load_daily_metrics(date_range)
-            journal_entries = self.load_weekly_journals(date_range)
-            weekly_signals = self.load_weekly_signals(date_range)
-            weekly_news = self.load_weekly_news(date_range)
+            # Load all data sources concurrently (disjoint files). File reads go to a
+            # separate pool: a loader never waits on a worker of its own pool
+            with ThreadPoolExecutor(max_workers=8, thread_name_prefix='weekly-io') as io_pool, \
+                    ThreadPoolExecutor(max_workers=4, thread_name_prefix='weekly-load') as loaders:
+                daily_future = loaders.submit(self.load_daily_metrics, date_range, io_pool)
+                journals_future = loaders.submit(self.load_weekly_journals, date_range, io_pool)
+                signals_future = loaders.submit(self.load_weekly_signals, date_range, io_pool)
+                news_future = loaders.submit(self.load_weekly_news, date_range, now, io_pool)
+                daily_data = daily_future.result()
+                journal_entries = journals_future.result()
+                weekly_signals = signals_future.result()
+                weekly_news = news_future.result()
             
             # Aggregate performance metrics
             performance = self.aggregate_performance_metrics(daily_data)
@@ -451,14 +631,10 @@ class WeeklyDataAssembler:
                 
                 # Best/Worst day from daily_performances
                 daily_perf = performance.get('daily_performances', [])
-                valid_days = [d for d in daily_perf if d.get('signals', 0) > 0 and d.get('success_rate') != 'n/a']
+                valid_days = [d for d in daily_perf if d.get('accuracy_val') is not None]
                 try:
                     if valid_days:
-                        # Parse numeric accuracy
-                        for d in valid_days:
-                            d['_acc_val'] = float(str(d.get('success_rate', '0').replace('%','')))
-                        best_day = max(valid_days, key=lambda x: x['_acc_val'])
-                        worst_day = min(valid_days, key=lambda x: x['_acc_val'])
+                        best_day, worst_day, most_active, acc_delta = _week_stats(valid_days)
                         summary_parts.append(
                             f"Best day: {best_day.get('day','')[:3]} ({best_day.get('success_rate')})"
                         )
@@ -474,11 +650,9 @@ class WeeklyDataAssembler:
             
             # Append trend delta if available
             try:
-                # Compute trend from daily_performances
-                dp = performance['daily_performances']
-                vals = [float(str(d.get('success_rate','0').replace('%',''))) for d in dp if d.get('signals',0)>0 and d.get('success_rate')!='n/a']
-                if len(vals) >= 2:
-                    delta = vals[-1] - vals[0]
+                # Trend from the week stats (valid days only)
+                if performance['total_predictions'] > 0 and len(valid_days) >= 2:
+                    delta = acc_delta
                     trend_note = f" Trend: {'+' if delta>=0 else ''}{delta:.0f}pp vs start of week."
                     summary += trend_note
             except Exception:
@@ -490,8 +664,7 @@ class WeeklyDataAssembler:
             highlights = []
             if performance['total_predictions'] > 0 and valid_days:
                 highlights.append(f"Hit ratio by day: " + ", ".join([f"{d.get('day','')[:3]} {d.get('success_rate')}" for d in valid_days]))
-                # Most active day
-                most_active = max(valid_days, key=lambda x: x.get('signals', 0))
+                # Most active day (computed with best/worst day)
                 highlights.append(f"Most active day: {most_active.get('day','')} ({most_active.get('signals',0)} signals)")
                 # No-signal days
                 zero_days = [d for d in daily_perf if d.get('signals', 0) == 0]
@@ -502,9 +675,7 @@ class WeeklyDataAssembler:
             # Accuracy trend direction
             try:
                 if valid_days and len(valid_days) >= 2:
-                    first_acc = valid_days[0]['_acc_val']
-                    last_acc = valid_days[-1]['_acc_val']
-                    delta = last_acc - first_acc
+                    delta = acc_delta
                     if delta > 10:
                         trend_txt = f"Accuracy trend improving (+{delta:.0f}pp)"
                     elif delta < -10:
@@ -521,6 +692,14 @@ class WeeklyDataAssembler:
             weekly_data['content_highlights'] = highlights
             weekly_data['weekly_trend'] = weekly_trend
             
+            # Per-asset attribution, resolved and parsed once for the sections below
+            ap_root: Dict[str, Any] = {}
+            if isinstance(performance_attribution, dict):
+                asset_attr = performance_attribution.get('asset_attribution')
+                if isinstance(asset_attr, dict) and isinstance(asset_attr.get('asset_performance'), dict):
+                    ap_root = asset_attr['asset_performance']
+            asset_stats = list(_asset_accuracies(ap_root))
+            
             # What worked / What didn’t (data‑driven summary)
             what_worked: List[str] = []
             what_didnt: List[str] = []
@@ -531,38 +710,20 @@ class WeeklyDataAssembler:
                     worst_txt = f"Worst day: {worst_day.get('day','')[:3]} ({worst_day.get('success_rate')}) with {worst_day.get('signals',0)} signals"
                     what_worked.append(best_txt)
                     # Only add worst if really weak
-                    try:
-                        worst_acc_val = float(str(worst_day.get('success_rate','0').replace('%','')))
-                        if worst_acc_val < 50:
-                            what_didnt.append(worst_txt)
-                    except Exception:
-                        pass
-                # Asset-level info if available
-                if isinstance(performance_attribution, dict):
-                    ap = performance_attribution.get('asset_attribution', {}).get('asset_performance', {})
-                    if isinstance(ap, dict) and ap:
-                        best_asset = None
-                        worst_asset = None
-                        for asset, info in ap.items():
-                            try:
-                                total = int(info.get('total_predictions',0) or 0)
-                                acc_val = float(str(info.get('accuracy','0%')).replace('%',''))
-                            except Exception:
-                                continue
-                            if total < 2:
-                                continue
-                            if best_asset is None or acc_val > best_asset[2]:
-                                best_asset = (asset, total, acc_val)
-                            if worst_asset is None or acc_val < worst_asset[2]:
-                                worst_asset = (asset, total, acc_val)
-                        if best_asset and best_asset[2] >= 60:
-                            what_worked.append(
-                                f"Strong asset: {best_asset[0]} {best_asset[2]:.0f}% accuracy on {best_asset[1]} signals"
-                            )
-                        if worst_asset and worst_asset[2] < 50:
-                            what_didnt.append(
-                                f"Weak asset: {worst_asset[0]} {worst_asset[2]:.0f}% accuracy on {worst_asset[1]} signals"
-                            )
+                    if worst_day['accuracy_val'] < 50:
+                        what_didnt.append(worst_txt)
+                # Asset-level info if available (first asset wins on ties)
+                if asset_stats:
+                    best_asset = max(asset_stats, key=itemgetter(2))
+                    worst_asset = min(asset_stats, key=itemgetter(2))
+                    if best_asset[2] >= 60:
+                        what_worked.append(
+                            f"Strong asset: {best_asset[0]} {best_asset[2]:.0f}% accuracy on {best_asset[1]} signals"
+                        )
+                    if worst_asset[2] < 50:
+                        what_didnt.append(
+                            f"Weak asset: {worst_asset[0]} {worst_asset[2]:.0f}% accuracy on {worst_asset[1]} signals"
+                        )
             except Exception as e:
                 log.debug(f"[ASSEMBLER] What worked/what didn’t summary error: {e}")
             weekly_data['what_worked'] = what_worked
@@ -572,9 +733,8 @@ class WeeklyDataAssembler:
             next_week_focus = []
             try:
                 # 1) Success rate rule
-                sr_str = weekly_data['performance_metrics'].get('success_rate','n/a')
-                if sr_str != 'n/a':
-                    sr = float(sr_str.replace('%',''))
+                if performance['total_predictions'] > 0:
+                    sr = round(performance['overall_accuracy'])  # as shown in success_rate
                     if sr < 60:
                         next_week_focus.append('Optimize signals/features and reduce size until accuracy improves (<60%)')
                 # 2) Risk level / regime rule
@@ -582,21 +742,10 @@ class WeeklyDataAssembler:
                 if rl in ('HIGH','MEDIUM'):
                     next_week_focus.append('Wait for directional clarity; trade smaller size in elevated risk regime')
                 # 3) Asset-specific rule (avoid poor performer if enough signals)
-                ap = (performance_attribution or {}).get('asset_attribution',{}).get('asset_performance',{})
-                if isinstance(ap, dict) and ap:
-                    # pick worst with >=2 predictions
-                    worst = None
-                    for asset, info in ap.items():
-                        try:
-                            total = int(info.get('total_predictions',0) or 0)
-                            acc = float(str(info.get('accuracy','0%')).replace('%',''))
-                        except Exception:
-                            continue
-                        if total >= 2:
-                            if worst is None or acc < worst[1]:
-                                worst = (asset, acc)
-                    if worst and worst[1] < 40:
-                        next_week_focus.append(f"Avoid {worst[0]} setups until pattern improves ({worst[1]:.0f}% recent accuracy)")
+                # pick worst with >=2 predictions (first one on ties)
+                worst = min(asset_stats, key=itemgetter(2), default=None)
+                if worst and worst[2] < 40:
+                    next_week_focus.append(f"Avoid {worst[0]} setups until pattern improves ({worst[2]:.0f}% recent accuracy)")
             except Exception:
                 pass
             if not next_week_focus:
@@ -611,24 +760,23 @@ class WeeklyDataAssembler:
             # Asset focus (top assets by signal count this week, no fabricated accuracy)
             asset_focus = []
             try:
-                asset_counts: Dict[str, int] = {}
-                for day in weekly_signals:
-                    for sig in day.get('signals', []) or []:
-                        asset = sig.get('asset')
-                        if not asset:
-                            continue
-                        asset_counts[asset] = asset_counts.get(asset, 0) + 1
+                # Counter counts in C (_count_elements): the cost is walking the signal
+                # dicts, which a numpy bincount would need as well to build its index array
+                asset_counts = Counter(
+                    sig['asset']
+                    for day in weekly_signals
+                    for sig in (day.get('signals') or [])
+                    if sig.get('asset')
+                )
                 if asset_counts:
-                    # Sort by number of signals (desc) and take top 2
-                    top_assets = sorted(asset_counts.items(), key=lambda kv: kv[1], reverse=True)[:2]
+                    # Top 2 by number of signals (ties keep first-seen order)
+                    top_assets = asset_counts.most_common(2)
                     # Optionally attach real per-asset accuracy when available from performance_attribution
-                    ap_root = performance_attribution.get('asset_attribution', {}).get('asset_performance', {}) if isinstance(performance_attribution, dict) else {}
                     for name, count in top_assets:
                         acc_val = None
-                        if isinstance(ap_root, dict):
-                            info = ap_root.get(name) or {}
-                            if info.get('accuracy') not in (None, "", "0", 0):
-                                acc_val = info.get('accuracy')
+                        info = ap_root.get(name) or {}
+                        if info.get('accuracy') not in (None, "", "0", 0):
+                            acc_val = info.get('accuracy')
                         asset_focus.append({
                             'asset': name,
                             'accuracy': acc_val if acc_val is not None else 'n/a',
@@ -640,6 +788,10 @@ class WeeklyDataAssembler:
             
             log.info(f"[ASSEMBLER] Assembly complete: {performance['total_predictions']} predictions, {len(daily_data)} metric files, {len(journal_entries)} journals")
             
+            if len(_WEEKLY_CACHE) >= _WEEKLY_CACHE_MAX:
+                _WEEKLY_CACHE.pop(next(iter(_WEEKLY_CACHE)))
+            _WEEKLY_CACHE[cache_key] = copy.deepcopy(weekly_data)
+            
             return weekly_data
             
         except Exception as e:
@@ -651,43 +803,260 @@ class WeeklyDataAssembler:
         try:
             log.info("[WEEKLY-PROCESS] Starting complete weekly period processing...")
             
+            # Without PDF generation the result would be discarded: skip the assembly
+            if not DEPENDENCIES_AVAILABLE:
+                log.warning("[WEEKLY-PROCESS] PDF generation not available")
+                return False
+            
             # Assemble weekly data
             weekly_data = self.assemble_weekly_data(target_date)
             if not weekly_data:
                 log.error("[WEEKLY-PROCESS] Failed to assemble weekly data")
                 return False
             
-            # Generate PDF with charts if modules available
-            if DEPENDENCIES_AVAILABLE:
-                try:
-                    from pdf_generator import Createte_weekly_pdf
-                    pdf_path = Createte_weekly_pdf(weekly_data)
-                    if pdf_path:
-                        log.info(f"✅ [WEEKLY-PROCESS] PDF with charts generated: {pdf_path}")
-                        
-                        # Check if file was actually created and has reasonable size
-                        if os.path.exists(pdf_path):
-                            file_size = os.path.getsize(pdf_path)
-                            log.info(f"[WEEKLY-PROCESS] PDF file size: {file_size} bytes")
-                            if file_size > 1000:  # Reasonable minimum size
-                                return True
-                            else:
-                                log.warning(f"[WEEKLY-PROCESS] PDF file too small: {file_size} bytes")
+            # Generate PDF with charts
+            try:
+                pdf_path = Createte_weekly_pdf(weekly_data)
+                if pdf_path:
+                    log.info(f"✅ [WEEKLY-PROCESS] PDF with charts generated: {pdf_path}")
+                    
+                    # Check if file was actually created and has reasonable size
+                    if os.path.exists(pdf_path):
+                        file_size = os.path.getsize(pdf_path)
+                        log.info(f"[WEEKLY-PROCESS] PDF file size: {file_size} bytes")
+                        if file_size > 1000:  # Reasonable minimum size
+                            return True
                         else:
-                            log.error(f"[WEEKLY-PROCESS] PDF file not found: {pdf_path}")
+                            log.warning(f"[WEEKLY-PROCESS] PDF file too small: {file_size} bytes")
                     else:
-                        log.error("[WEEKLY-PROCESS] PDF generation returned no path")
-                except Exception as e:
-                    log.error(f"[WEEKLY-PROCESS] Error generating PDF: {e}")
-                    return False
-            else:
-                log.warning("[WEEKLY-PROCESS] PDF generation not available")
+                        log.error(f"[WEEKLY-PROCESS] PDF file not found: {pdf_path}")
+                else:
+                    log.error("[WEEKLY-PROCESS] PDF generation returned no path")
+            except Exception as e:
+                log.error(f"[WEEKLY-PROCESS] Error generating PDF: {e}")
                 return False
                 
         except Exception as e:
             log.error(f"[WEEKLY-PROCESS] Error in weekly processing: {e}")
             return False
 
+def _num(v):
+    """v if it is a plain int/float, None otherwise (bool and strings excluded)"""
+    return v if type(v) in (int, float) else None
+
+# Intestazione e key highlights del weekly report (riempiti con format_map)
+_HEADER_TMPL = (
+    "🏆 **SV - SISTEMA UNIFICATO TRADING**\n"
+    "📈 **WEEKLY PERFORMANCE REPORT**\n"
+    "📅 Week: {week_start} - {week_end} {month}\n"
+    "🕰️ Generated: {generated} (CET)\n"
+    "📊 Report ID: WR-{report_id}\n"
+    + "=" * 70 + "\n\n"
+    "🎯 **EXECUTIVE WEEKLY SUMMARY**\n\n"
+    "🔥 **KEY HIGHLIGHTS**:\n"
+    "{highlights}"
+    "• 🛡️ **Risk Control**: Max drawdown N/A - requires full P&L tracking (future enhancement)\n\n"
+)
+_HIGHLIGHTS_TMPL = (
+    "• 🧠 **AI System Accuracy**: {accuracy:.0f}% on {tracked} live-tracked predictions (aggregated from daily summaries)\n"
+    "• 🎩 **Prediction Success**: {hits} hits / {tracked} tracked assets\n"
+)
+_HIGHLIGHTS_NA = (
+    "• 🧠 **AI System Accuracy**: n/a (no aggregated live-tracked predictions this week)\n"
+    "• 🎩 **Prediction Success**: n/a - see daily journals for qualitative review\n"
+)
+
+# Payload del PDF settimanale: Createte_weekly_pdf legge un dict, asdict() al confine
+@dataclass(slots=True)
+class WeekData:
+    week_start: str
+    week_end: str
+    weekly_summary: str
+    performance_metrics: Dict[str, Any]
+    # For now we do not fabricate per-day P&L; leave this empty or descriptive only
+    daily_performance: List[Dict[str, Any]] = field(default_factory=list)
+    market_analysis: Dict[str, str] = field(default_factory=lambda: {
+        'regime': 'See textual weekly report for qualitative regime description',
+        'volatility': 'See volatility section (no synthetic %)',
+        'trend_strength': 'Described qualitatively (bullish/neutral/corrective)',
+        'sector_rotation': 'See sector rotation section',
+    })
+    risk_metrics: Dict[str, str] = field(default_factory=lambda: {
+        'risk_level': 'N/A',
+        'var_95': 'N/A',
+        'max_position': 'N/A',
+        'correlation_risk': 'N/A',
+    })
+    key_events: List[str] = field(default_factory=list)
+    next_week_outlook: str = 'See textual weekly report for qualitative outlook; no synthetic probabilities in PDF.'
+    next_week_strategy: List[str] = field(default_factory=list)
+    action_items: List[str] = field(default_factory=list)
+
+# Sezioni statiche del weekly report (costruite una volta all'import)
+_STATIC_BLOCKS = {
+    # Sezione 2: PERFORMANCE ANALYSIS (5 GIORNI)
+    'daily_breakdown': """\
+📊 **PERFORMANCE ANALYSIS (5 GIORNI)**
+
+🗓️ **Daily Breakdown (see Daily Summaries for numeric details)**:
+• **Lunedì**: Opening regime as described in Monday Daily Summary
+• **Martedì**: Continuation / reversal dynamics from intraday reports
+• **Mercoledì**: Policy / macro events handled as per Noon & Evening analysis
+• **Giovedì**: Earnings and sector flows summarized in daily content
+• **Venerdì**: Weekly close and positioning captured in Evening + Summary
+
+""",
+    'technical_signals': """\
+📈 **Technical Signals Weekly**:
+• **Trend Signals**: Evaluated daily via support/resistance and moving averages
+• **Momentum Indicators**: RSI/MACD behavior summarized qualitatively in Daily Summary
+• **Mean Reversion**: Effectiveness depends on regime (see risk notes in Page 2/3 of Daily Summary)
+• **Volume Analysis**: Assessed via daily flow commentary – no synthetic volume statistics here
+
+""",
+    # Sezione 3: TREND ANALYSIS & CORRELAZIONI
+    'trend': """\
+ðŸ”¬ **TREND ANALYSIS & CORRELAZIONI**
+
+📊 **Cross-Asset Correlations**:
+• **Equity–Crypto**: Positive relationship – crypto tends to follow risk-on periods
+• **USD–Gold**: Strong inverse relationship – classic risk-off pattern (qualitative, no fixed coefficient)
+• **Bonds–Stocks**: Typically inverse during risk-on phases
+• **VIX–S&P**: Strong inverse behavior as expected
+
+🌊 **Trend Strength Analysis**:
+• **Primary Trend**: Described as bullish / neutral / corrective in Daily Summaries based on real data
+• **Sector Rotation**: Growth vs Value leadership discussed qualitatively (no invented % spreads)
+• **Geographic**: US / Europe / Asia relative strength assessed from daily market review
+• **Style**: Large vs Small Cap dynamics covered without synthetic performance gaps
+
+⚡ **Momentum Persistence**:
+• **Equity Momentum**: Assessed from sequence of up/down days in Daily Summary (no synthetic 4/5 count)
+• **Crypto Momentum**: Qualitatively described using BTC/ETH daily moves
+• **FX Momentum**: USD vs majors evaluated from true weekly returns
+• **Commodity Momentum**: Energy/metals behavior summarized without invented numbers
+
+""",
+    # Sezione 4: SECTOR ROTATION ANALYSIS
+    'sector': """\
+ðŸŽ¯ **SECTOR ROTATION ANALYSIS**
+
+🏅 **Top Performers (Week)**:
+• **Technology**: Strong relative performance – AI and growth themes in focus
+• **Communication**: Benefited from earnings surprises and guidance
+• **Consumer Discretionary**: Supported by resilient spending signals
+• **Financials**: Helped by rate environment and credit stability
+
+🏆 **Underperformers (Week)**:
+• **Utilities**: Typical laggard in risk-on phases
+• **Real Estate**: Sensitive to rate expectations
+• **Consumer Staples**: Defensive profile less in demand
+• **Healthcare**: Mixed earnings and news flow
+
+🔄 **Rotation Drivers**:
+• **Growth vs Value**: Growth-oriented names favored, without specifying artificial performance gaps
+• **Quality vs Momentum**: Emphasis on liquid leaders and quality balance sheets
+• **Size**: Large-cap bias highlighted in daily flows
+• **Geography**: US focus described qualitatively instead of fixed % spreads
+
+""",
+    # Sezione 5: RISK METRICS & DRAWDOWNS
+    'risk': """\
+ðŸ›¡ï¸ **RISK METRICS & DRAWDOWNS**
+
+📊 **Portfolio Risk Analysis**:
+• **Max Drawdown**: N/A – requires real P&L tracking (not yet integrated)
+• **VaR (95%)**: N/A – will be computed from realized P&L in a future version
+• **Sharpe Ratio**: N/A – avoid synthetic ratios without full return history
+• **Sortino Ratio**: N/A – qualitative risk discussion only for now
+
+âš ï¸ **Risk Events This Week**:
+â€¢ **Fed Meeting**: Wednesday - dovish tilt, minimal impact
+â€¢ **Earnings Season**: 85% beat rate - positive surprise
+â€¢ **Geopolitical**: Stable - no major developments
+â€¢ **Economic Data**: Mixed but trend supportive
+
+🎲 **Volatility Analysis**:
+• **Realized Vol**: Discussed qualitatively using daily price ranges – no fixed % estimate
+• **Implied Vol**: VIX regime described in daily reports without forcing exact weekly averages
+• **Vol Skew**: Monitored via options commentary when relevant
+• **Term Structure**: Shape referenced qualitatively (contango/backwardation) only when supported by data
+
+""",
+    # Sezione 6: ADVANCED ANALYTICS & AI INSIGHTS
+    'analytics': """\
+🤖 **ADVANCED ANALYTICS & AI INSIGHTS**
+
+🎯 **AI PREDICTIONS FOR NEXT WEEK**:
+• **Bullish / Bearish Bias**: Derived qualitatively from current regime and Daily Summaries – no fixed % probability shown
+• **Market Sentiment**: Use sentiment sections in Press Review, Morning and Summary for real-time scores
+• **Volatility Forecast**: Described using ranges (low/medium/high) instead of invented numeric forecasts
+• **Key Risk Level**: Summarized qualitatively (LOW/MEDIUM/HIGH) based on actual event calendar and price behavior
+
+🔍 **PATTERN RECOGNITION**:
+• **Primary Patterns**: Flags, triangles and ranges observed during the week, described in daily technical commentary
+• **Time Frame**: Weekly chart context built from real intraday/closing data
+• **Confidence Level**: Expressed qualitatively (high/medium/low), not as synthetic percentages
+• **Targets**: Managed via daily support/resistance levels rather than fixed multi-week targets
+
+""",
+    # Sezione 7: WEEKEND MARKET OUTLOOK
+    'weekend': """\
+🏖️ **WEEKEND MARKET OUTLOOK**
+
+₿ **Weekend Crypto Focus**:
+• **Bitcoin**: Testing major resistance area – exact levels from live weekend crypto focus report
+• **Ethereum**: Following BTC trend – levels derived from real-time prices only
+• **Altcoins**: Selective strength, BTC dominance discussed qualitatively
+• **Weekend Patterns**: Typically quieter with lower liquidity and higher gap risk
+
+ðŸŒ **Global Weekend Factors**:
+â€¢ **Asia Closed**: No major market drivers expected
+â€¢ **European Events**: Limited weekend activity
+â€¢ **US Factors**: Minimal news flow expected
+â€¢ **Central Banks**: No speeches/events scheduled
+
+ðŸ“Š **Weekend Risk Factors**:
+â€¢ **Liquidity**: Thin - higher volatility potential
+â€¢ **News Sensitivity**: Higher impact if surprises occur
+â€¢ **Gap Risk**: Monday opening gap possibilities
+â€¢ **Crypto Volatility**: 24/7 trading continues
+
+""",
+    # Sezione 7: NEXT WEEK STRATEGIC SETUP
+    'next_week': """\
+ðŸ”® **NEXT WEEK STRATEGIC SETUP**
+
+ðŸ“… **Key Events Next Week**:
+â€¢ **Monday**: Market reopening, gap analysis
+â€¢ **Tuesday**: Economic data releases
+â€¢ **Wednesday**: FOMC minutes, volatility potential
+â€¢ **Thursday**: Earnings continuation
+â€¢ **Friday**: Monthly close, rebalancing flows
+
+ðŸŽ¯ **Strategic Positioning**:
+â€¢ **Equity Overweight**: Continue tech/growth bias
+â€¢ **Crypto Allocation**: Maintain BTC/ETH core positions
+â€¢ **FX Strategy**: USD strength theme intact
+â€¢ **Fixed Income**: Underweight, rates rising
+â€¢ **Commodities**: Selective - energy positive, metals neutral
+
+🤖 **ML Model Predictions (Next Week)**:
+• **Consensus**: Bias (bullish/neutral/bearish) inferred from latest Daily Summaries – no artificial confidence %
+• **S&P 500**: Monitor resistance/support zones defined by real weekly closes, not fixed numeric targets
+• **NASDAQ**: Tech leadership narrative continues or fades based on actual price action
+• **Bitcoin**: Key resistance/support zones derived from live BTC/USD levels only (no 118K placeholder)
+• **EUR/USD**: Directional bias linked to real FX data and central bank communication
+
+⚠️ **Risk Management Next Week**:
+• **Position Sizing**: Normal allocation maintained, adjusted only when real volatility regimes change
+• **Stop Losses**: Based on actual technical levels from daily charts
+• **Hedge Ratio**: Qualitative indication of protection level (no fixed % without full portfolio context)
+• **Volatility Watch**: Focus on concrete risk events (e.g. FOMC minutes) highlighted in calendar modules
+
+""",
+}
+
 class WeeklyReportGeneratetor:
     def __init__(self):
         """Initialize weekly report Generatetor"""
@@ -738,71 +1107,71 @@ class WeeklyReportGeneratetor:
                     log.warning(f"⚠️ [WEEKLY-AGG] Error loading weekly metrics: {e}")
                     weekly_metrics = {}
             
-            # Enhanced Header with branding
-            report = f"🏆 **SV - SISTEMA UNIFICATO TRADING**\n"
-            report += f"📈 **WEEKLY PERFORMANCE REPORT**\n"
-            report += f"📅 Week: {week_start} - {week_end} {now.strftime('%B %Y')}\n"
-            report += f"🕰️ Generated: {now.strftime('%A, %d %B %Y at %H:%M')} (CET)\n"
-            report += f"📊 Report ID: WR-{now.strftime('%Y%m%d-%H%M')}\n"
-            report += "=" * 70 + "\n\n"
-            
-            # SEZIONE 1: EXECUTIVE WEEKLY SUMMARY - ENHANCED
-            report += "🎯 **EXECUTIVE WEEKLY SUMMARY**\\n\\n"
+            # Report built as a list of parts, joined once at the end
+            parts: List[str] = []
             
             # Derive performance metrics from real aggregated data when available
-            pred = weekly_metrics.get('prediction', {}) if isinstance(weekly_metrics, dict) else {}
+            # (type check and lookups done once, shared by text and PDF)
+            wm = weekly_metrics if isinstance(weekly_metrics, dict) else {}
+            pred = wm.get('prediction') or {}
             total_tracked = int(pred.get('total_tracked', 0) or 0)
             weekly_accuracy = float(pred.get('accuracy_pct', 0.0) or 0.0)
             hits = int(pred.get('hits', 0) or 0)
 
-            assets = weekly_metrics.get('assets', {}) if isinstance(weekly_metrics, dict) else {}
-            spx_info = assets.get('SPX', {})
-            btc_info = assets.get('BTC', {})
-            eur_info = assets.get('EURUSD', {})
-            gold_info = assets.get('GOLD', {})
+            assets = wm.get('assets') or {}
+            spx_info = assets.get('SPX') or {}
+            btc_info = assets.get('BTC') or {}
+            eur_info = assets.get('EURUSD') or {}
+            gold_info = assets.get('GOLD') or {}
 
-            spx_ret = spx_info.get('return_pct')
-            btc_ret = btc_info.get('return_pct')
-            eur_ret = eur_info.get('return_pct')
-            gold_ret = gold_info.get('return_pct')
-            
-            report += f"🔥 **KEY HIGHLIGHTS**:\\n"
-            if total_tracked > 0:
-                report += f"• 🧠 **AI System Accuracy**: {weekly_accuracy:.0f}% on {total_tracked} live-tracked predictions (aggregated from daily summaries)\\n"
-                report += f"• 🎩 **Prediction Success**: {hits} hits / {total_tracked} tracked assets\\n"
-            else:
-                report += "• 🧠 **AI System Accuracy**: n/a (no aggregated live-tracked predictions this week)\\n"
-                report += "• 🎩 **Prediction Success**: n/a - see daily journals for qualitative review\\n"
-            report += "• 🛡️ **Risk Control**: Max drawdown N/A - requires full P&L tracking (future enhancement)\\n\\n"
+            # Weekly returns: number or None, checked once here
+            spx_ret = _num(spx_info.get('return_pct'))
+            btc_ret = _num(btc_info.get('return_pct'))
+            eur_ret = _num(eur_info.get('return_pct'))
+            gold_ret = _num(gold_info.get('return_pct'))
+            
+            # Enhanced Header with branding + SEZIONE 1: EXECUTIVE WEEKLY SUMMARY (key highlights)
+            ctx = {
+                'week_start': week_start,
+                'week_end': week_end,
+                'month': now.strftime('%B %Y'),
+                'generated': now.strftime('%A, %d %B %Y at %H:%M'),
+                'report_id': now.strftime('%Y%m%d-%H%M'),
+                'accuracy': weekly_accuracy,
+                'tracked': total_tracked,
+                'hits': hits,
+            }
+            ctx['highlights'] = _HIGHLIGHTS_TMPL.format_map(ctx) if total_tracked > 0 else _HIGHLIGHTS_NA
+            parts.append(_HEADER_TMPL.format_map(ctx))
             
             # Market performance snapshot based on real weekly returns when available
-            report += f"🌍 **GLOBAL MARKETS SNAPSHOT**:\\n"
-            if isinstance(spx_ret, (int, float)):
-                report += f"• 🇺🇸 **S&P 500**: {spx_ret:+.1f}% (Mon→Fri, aggregated from daily close snapshots)\\n"
+            parts.append(f"🌍 **GLOBAL MARKETS SNAPSHOT**:\n")
+            if spx_ret is not None:
+                parts.append(f"• 🇺🇸 **S&P 500**: {spx_ret:+.1f}% (Mon→Fri, aggregated from daily close snapshots)\n")
             else:
-                report += "• 🇺🇸 **S&P 500**: Weekly performance n/a (insufficient daily metrics)\\n"
+                parts.append("• 🇺🇸 **S&P 500**: Weekly performance n/a (insufficient daily metrics)\n")
 
             # NASDAQ kept qualitative only to avoid invented levels
-            report += "• 💻 **NASDAQ**: Tech-heavy index broadly aligned with S&P 500 trend (see daily reports for details)\\n"
+            parts.append("• 💻 **NASDAQ**: Tech-heavy index broadly aligned with S&P 500 trend (see daily reports for details)\n")
 
-            if isinstance(btc_ret, (int, float)):
-                report += f"• ₿ **Bitcoin**: {btc_ret:+.1f}% (weekly move based on daily BTC/USD snapshots)\\n"
+            if btc_ret is not None:
+                parts.append(f"• ₿ **Bitcoin**: {btc_ret:+.1f}% (weekly move based on daily BTC/USD snapshots)\n")
             else:
-                report += "• ₿ **Bitcoin**: Weekly performance n/a (insufficient daily metrics)\\n"
+                parts.append("• ₿ **Bitcoin**: Weekly performance n/a (insufficient daily metrics)\n")
 
-            if isinstance(eur_ret, (int, float)):
-                report += f"• 💵 **EUR/USD**: {eur_ret:+.1f}% - aggregated FX move over the week\\n"
+            if eur_ret is not None:
+                parts.append(f"• 💵 **EUR/USD**: {eur_ret:+.1f}% - aggregated FX move over the week\n")
             else:
-                report += "• 💵 **EUR/USD**: Weekly FX move n/a (insufficient daily metrics)\\n"
+                parts.append("• 💵 **EUR/USD**: Weekly FX move n/a (insufficient daily metrics)\n")
 
             # Gold: numeric only when based on aggregated USD/gram snapshots, otherwise qualitative
-            if isinstance(gold_ret, (int, float)):
-                report += f"• 🥇 **Gold (USD/g)**: {gold_ret:+.1f}% - safe haven performance based on daily USD/gram data\\n"
+            if gold_ret is not None:
+                parts.append(f"• 🥇 **Gold (USD/g)**: {gold_ret:+.1f}% - safe haven performance based on daily USD/gram data\n")
             else:
-                report += "• 🥇 **Gold**: Safe haven flows (see daily reports for detailed performance)\\n\\n"
+                parts.append("• 🥇 **Gold**: Safe haven flows (see daily reports for detailed performance)\n\n")
             
             # Week character: qualitative summary derived from price direction
-            if isinstance(spx_ret, (int, float)) and isinstance(btc_ret, (int, float)):
+            if spx_ret is not None and btc_ret is not None:
                 if spx_ret > 0 and btc_ret > 0:
                     week_character = "Risk-on week with both equities and crypto positive"
                 elif spx_ret > 0 and btc_ret <= 0:
@@ -814,232 +1183,77 @@ class WeeklyReportGeneratetor:
             else:
                 week_character = "Character not fully measurable yet (waiting for more daily metrics)"
 
-            report += f"🎨 **WEEK CHARACTER**: {week_character}, sector rotation active, volatility monitored via daily reports\\n\\n"
+            parts.append(f"🎨 **WEEK CHARACTER**: {week_character}, sector rotation active, volatility monitored via daily reports\n\n")
             
             # SEZIONE 2: PERFORMANCE ANALYSIS (5 GIORNI)
-            report += "📊 **PERFORMANCE ANALYSIS (5 GIORNI)**\\n\\n"
-            report += f"🗓️ **Daily Breakdown (see Daily Summaries for numeric details)**:\\n"
-            report += f"• **Lunedì**: Opening regime as described in Monday Daily Summary\\n"
-            report += f"• **Martedì**: Continuation / reversal dynamics from intraday reports\\n"
-            report += f"• **Mercoledì**: Policy / macro events handled as per Noon & Evening analysis\\n" 
-            report += f"• **Giovedì**: Earnings and sector flows summarized in daily content\\n"
-            report += f"• **Venerdì**: Weekly close and positioning captured in Evening + Summary\\n\\n"
+            parts.append(_STATIC_BLOCKS['daily_breakdown'])
             
-            report += f"🤖 **ML Models Weekly Performance**:\\n"
+            parts.append(f"🤖 **ML Models Weekly Performance**:\n")
             if total_tracked > 0:
-                report += f"• **Ensemble**: {weekly_accuracy:.0f}% accuracy on {total_tracked} tracked signals (see Daily Summaries pages 1–3)\\n"
+                parts.append(f"• **Ensemble**: {weekly_accuracy:.0f}% accuracy on {total_tracked} tracked signals (see Daily Summaries pages 1–3)\n")
             else:
-                report += f"• **Ensemble**: n/a – no live-tracked predictions aggregated this week\\n"
-            report += f"• **Individual Models**: Qualitative review only – per-model weekly accuracy not yet aggregated\\n\\n"
-            
-            report += f"📈 **Technical Signals Weekly**:\\n"
-            report += f"• **Trend Signals**: Evaluated daily via support/resistance and moving averages\\n"
-            report += f"• **Momentum Indicators**: RSI/MACD behavior summarized qualitatively in Daily Summary\\n"
-            report += f"• **Mean Reversion**: Effectiveness depends on regime (see risk notes in Page 2/3 of Daily Summary)\\n"
-            report += f"• **Volume Analysis**: Assessed via daily flow commentary – no synthetic volume statistics here\\n\\n"
-            
-            # SEZIONE 3: TREND ANALYSIS & CORRELAZIONI
-            report += "ðŸ”¬ **TREND ANALYSIS & CORRELAZIONI**\n\n"
-            report += f"📊 **Cross-Asset Correlations**:\\n"
-            report += f"• **Equity–Crypto**: Positive relationship – crypto tends to follow risk-on periods\\n"
-            report += f"• **USD–Gold**: Strong inverse relationship – classic risk-off pattern (qualitative, no fixed coefficient)\\n"
-            report += f"• **Bonds–Stocks**: Typically inverse during risk-on phases\\n"
-            report += f"• **VIX–S&P**: Strong inverse behavior as expected\\n\\n"
-            
-            report += f"🌊 **Trend Strength Analysis**:\\n"
-            report += f"• **Primary Trend**: Described as bullish / neutral / corrective in Daily Summaries based on real data\\n"
-            report += f"• **Sector Rotation**: Growth vs Value leadership discussed qualitatively (no invented % spreads)\\n"
-            report += f"• **Geographic**: US / Europe / Asia relative strength assessed from daily market review\\n"
-            report += f"• **Style**: Large vs Small Cap dynamics covered without synthetic performance gaps\\n\\n"
-            
-            report += f"⚡ **Momentum Persistence**:\\n"
-            report += f"• **Equity Momentum**: Assessed from sequence of up/down days in Daily Summary (no synthetic 4/5 count)\\n"
-            report += f"• **Crypto Momentum**: Qualitatively described using BTC/ETH daily moves\\n"
-            report += f"• **FX Momentum**: USD vs majors evaluated from true weekly returns\\n"
-            report += f"• **Commodity Momentum**: Energy/metals behavior summarized without invented numbers\\n\\n"
-            
-            # SEZIONE 4: SECTOR ROTATION ANALYSIS
-            report += "ðŸŽ¯ **SECTOR ROTATION ANALYSIS**\n\n"
-            report += f"🏅 **Top Performers (Week)**:\\n"
-            report += f"• **Technology**: Strong relative performance – AI and growth themes in focus\\n"
-            report += f"• **Communication**: Benefited from earnings surprises and guidance\\n"
-            report += f"• **Consumer Discretionary**: Supported by resilient spending signals\\n"
-            report += f"• **Financials**: Helped by rate environment and credit stability\\n\\n"
-            
-            report += f"🏆 **Underperformers (Week)**:\\n"
-            report += f"• **Utilities**: Typical laggard in risk-on phases\\n"
-            report += f"• **Real Estate**: Sensitive to rate expectations\\n"
-            report += f"• **Consumer Staples**: Defensive profile less in demand\\n"
-            report += f"• **Healthcare**: Mixed earnings and news flow\\n\\n"
-            
-            report += f"🔄 **Rotation Drivers**:\\n"
-            report += f"• **Growth vs Value**: Growth-oriented names favored, without specifying artificial performance gaps\\n"
-            report += f"• **Quality vs Momentum**: Emphasis on liquid leaders and quality balance sheets\\n"
-            report += f"• **Size**: Large-cap bias highlighted in daily flows\\n"
-            report += f"• **Geography**: US focus described qualitatively instead of fixed % spreads\\n\\n"
+                parts.append(f"• **Ensemble**: n/a – no live-tracked predictions aggregated this week\n")
+            parts.append(f"• **Individual Models**: Qualitative review only – per-model weekly accuracy not yet aggregated\n\n")
             
-            # SEZIONE 5: RISK METRICS & DRAWDOWNS
-            report += "ðŸ›¡ï¸ **RISK METRICS & DRAWDOWNS**\n\n"
-            report += f"📊 **Portfolio Risk Analysis**:\\n"
-            report += f"• **Max Drawdown**: N/A – requires real P&L tracking (not yet integrated)\\n"
-            report += f"• **VaR (95%)**: N/A – will be computed from realized P&L in a future version\\n"
-            report += f"• **Sharpe Ratio**: N/A – avoid synthetic ratios without full return history\\n"
-            report += f"• **Sortino Ratio**: N/A – qualitative risk discussion only for now\\n\\n"
+            parts.append(_STATIC_BLOCKS['technical_signals'])
             
-            report += f"âš ï¸ **Risk Events This Week**:\n"
-            report += f"â€¢ **Fed Meeting**: Wednesday - dovish tilt, minimal impact\n"
-            report += f"â€¢ **Earnings Season**: 85% beat rate - positive surprise\n"
-            report += f"â€¢ **Geopolitical**: Stable - no major developments\n"
-            report += f"â€¢ **Economic Data**: Mixed but trend supportive\n\n"
-            
-            report += f"🎲 **Volatility Analysis**:\\n"
-            report += f"• **Realized Vol**: Discussed qualitatively using daily price ranges – no fixed % estimate\\n"
-            report += f"• **Implied Vol**: VIX regime described in daily reports without forcing exact weekly averages\\n"
-            report += f"• **Vol Skew**: Monitored via options commentary when relevant\\n"
-            report += f"• **Term Structure**: Shape referenced qualitatively (contango/backwardation) only when supported by data\\n\\n"
-            
-            # SEZIONE 6: ADVANCED ANALYTICS & AI INSIGHTS
-            report += "🤖 **ADVANCED ANALYTICS & AI INSIGHTS**\\n\\n"
-            
-            # AI-driven outlook is kept qualitative to avoid fake probabilities
-            report += f"🎯 **AI PREDICTIONS FOR NEXT WEEK**:\\n"
-            report += f"• **Bullish / Bearish Bias**: Derived qualitatively from current regime and Daily Summaries – no fixed % probability shown\\n"
-            report += f"• **Market Sentiment**: Use sentiment sections in Press Review, Morning and Summary for real-time scores\\n"
-            report += f"• **Volatility Forecast**: Described using ranges (low/medium/high) instead of invented numeric forecasts\\n"
-            report += f"• **Key Risk Level**: Summarized qualitatively (LOW/MEDIUM/HIGH) based on actual event calendar and price behavior\\n\\n"
-            
-            # Pattern recognition: descriptive only
-            report += f"🔍 **PATTERN RECOGNITION**:\\n"
-            report += f"• **Primary Patterns**: Flags, triangles and ranges observed during the week, described in daily technical commentary\\n"
-            report += f"• **Time Frame**: Weekly chart context built from real intraday/closing data\\n"
-            report += f"• **Confidence Level**: Expressed qualitatively (high/medium/low), not as synthetic percentages\\n"
-            report += f"• **Targets**: Managed via daily support/resistance levels rather than fixed multi-week targets\\n\\n"
-            
-            # SEZIONE 7: WEEKEND MARKET OUTLOOK
-            report += "🏖️ **WEEKEND MARKET OUTLOOK**\n\n"
-            report += f"₿ **Weekend Crypto Focus**:\\n"
-            report += f"• **Bitcoin**: Testing major resistance area – exact levels from live weekend crypto focus report\\n"
-            report += f"• **Ethereum**: Following BTC trend – levels derived from real-time prices only\\n"
-            report += f"• **Altcoins**: Selective strength, BTC dominance discussed qualitatively\\n"
-            report += f"• **Weekend Patterns**: Typically quieter with lower liquidity and higher gap risk\\n\\n"
-            
-            report += f"ðŸŒ **Global Weekend Factors**:\n"
-            report += f"â€¢ **Asia Closed**: No major market drivers expected\n"
-            report += f"â€¢ **European Events**: Limited weekend activity\n"
-            report += f"â€¢ **US Factors**: Minimal news flow expected\n"
-            report += f"â€¢ **Central Banks**: No speeches/events scheduled\n\n"
-            
-            report += f"ðŸ“Š **Weekend Risk Factors**:\n"
-            report += f"â€¢ **Liquidity**: Thin - higher volatility potential\n"
-            report += f"â€¢ **News Sensitivity**: Higher impact if surprises occur\n"
-            report += f"â€¢ **Gap Risk**: Monday opening gap possibilities\n"
-            report += f"â€¢ **Crypto Volatility**: 24/7 trading continues\n\n"
-            
-            # SEZIONE 7: NEXT WEEK STRATEGIC SETUP
-            report += "ðŸ”® **NEXT WEEK STRATEGIC SETUP**\n\n"
-            report += f"ðŸ“… **Key Events Next Week**:\n"
-            report += f"â€¢ **Monday**: Market reopening, gap analysis\n"
-            report += f"â€¢ **Tuesday**: Economic data releases\n"
-            report += f"â€¢ **Wednesday**: FOMC minutes, volatility potential\n"
-            report += f"â€¢ **Thursday**: Earnings continuation\n"
-            report += f"â€¢ **Friday**: Monthly close, rebalancing flows\n\n"
-            
-            report += f"ðŸŽ¯ **Strategic Positioning**:\n"
-            report += f"â€¢ **Equity Overweight**: Continue tech/growth bias\n"
-            report += f"â€¢ **Crypto Allocation**: Maintain BTC/ETH core positions\n"
-            report += f"â€¢ **FX Strategy**: USD strength theme intact\n"
-            report += f"â€¢ **Fixed Income**: Underweight, rates rising\n"
-            report += f"â€¢ **Commodities**: Selective - energy positive, metals neutral\n\n"
-            
-            report += f"🤖 **ML Model Predictions (Next Week)**:\\n"
-            report += f"• **Consensus**: Bias (bullish/neutral/bearish) inferred from latest Daily Summaries – no artificial confidence %\\n"
-            report += f"• **S&P 500**: Monitor resistance/support zones defined by real weekly closes, not fixed numeric targets\\n"
-            report += f"• **NASDAQ**: Tech leadership narrative continues or fades based on actual price action\\n"
-            report += f"• **Bitcoin**: Key resistance/support zones derived from live BTC/USD levels only (no 118K placeholder)\\n"
-            report += f"• **EUR/USD**: Directional bias linked to real FX data and central bank communication\\n\\n"
-            
-            report += f"⚠️ **Risk Management Next Week**:\\n"
-            report += f"• **Position Sizing**: Normal allocation maintained, adjusted only when real volatility regimes change\\n"
-            report += f"• **Stop Losses**: Based on actual technical levels from daily charts\\n"
-            report += f"• **Hedge Ratio**: Qualitative indication of protection level (no fixed % without full portfolio context)\\n"
-            report += f"• **Volatility Watch**: Focus on concrete risk events (e.g. FOMC minutes) highlighted in calendar modules\\n\\n"
+            # SEZIONI 3-7: testo statico (trend, settori, rischio, analytics, weekend, next week)
+            parts.append(_STATIC_BLOCKS['trend'])
+            parts.append(_STATIC_BLOCKS['sector'])
+            parts.append(_STATIC_BLOCKS['risk'])
+            parts.append(_STATIC_BLOCKS['analytics'])
+            parts.append(_STATIC_BLOCKS['weekend'])
+            parts.append(_STATIC_BLOCKS['next_week'])
             
             # FOOTER
-            report += "-" * 60 + "\n"
-            report += f"✅ **SV WEEKLY REPORT COMPLETE**\n"
-            report += f"📈 Next Weekly Report: {(_now_it() + datetime.timedelta(days=7)).strftime('%A %d %B')}\n"
-            report += f"📊 Monday Resume: 08:00 Press Review\n"
-            report += f"🤖 ML Models: Continuous learning from weekly data\n"
-            report += f"📁 Report saved to: reports/2_weekly/\n\n"
+            parts.append("-" * 60 + "\n")
+            parts.append(f"✅ **SV WEEKLY REPORT COMPLETE**\n")
+            parts.append(f"📈 Next Weekly Report: {(_now_it() + datetime.timedelta(days=7)).strftime('%A %d %B')}\n")
+            parts.append(f"📊 Monday Resume: 08:00 Press Review\n")
+            parts.append(f"🤖 ML Models: Continuous learning from weekly data\n")
+            parts.append(f"📁 Report saved to: reports/2_weekly/\n\n")
             
             # Generatete PDF if available
             if DEPENDENCIES_AVAILABLE:
                 try:
-                    # Create data structure using the same real aggregated weekly metrics
-                    pred_pdf = weekly_metrics.get('prediction', {}) if isinstance(weekly_metrics, dict) else {}
-                    assets_pdf = weekly_metrics.get('assets', {}) if isinstance(weekly_metrics, dict) else {}
-
-                    total_tracked_pdf = int(pred_pdf.get('total_tracked', 0) or 0)
-                    weekly_acc_pdf = float(pred_pdf.get('accuracy_pct', 0.0) or 0.0)
-                    spx_pdf = assets_pdf.get('SPX', {})
-                    spx_ret_pdf = spx_pdf.get('return_pct')
-
+                    # Create data structure from the same values used in the text report
                     summary_parts = []
-                    if total_tracked_pdf > 0:
+                    if total_tracked > 0:
                         summary_parts.append(
-                            f"Aggregated weekly accuracy {weekly_acc_pdf:.0f}% on {total_tracked_pdf} live-tracked predictions."
+                            f"Aggregated weekly accuracy {weekly_accuracy:.0f}% on {total_tracked} live-tracked predictions."
                         )
                     else:
                         summary_parts.append(
                             "Weekly accuracy not available (no aggregated live-tracked predictions)."
                         )
-                    if isinstance(spx_ret_pdf, (int, float)):
+                    if spx_ret is not None:
                         summary_parts.append(
-                            f"S&P 500 weekly move {spx_ret_pdf:+.1f}% (Mon→Fri, based on real closes)."
+                            f"S&P 500 weekly move {spx_ret:+.1f}% (Mon→Fri, based on real closes)."
                         )
                     weekly_summary_text = " ".join(summary_parts)
                     
-                    week_data = {
-                        'week_start': week_start,
-                        'week_end': week_end,
-                        'weekly_summary': weekly_summary_text,
-                        'performance_metrics': {
-                            'total_signals': total_tracked_pdf,
-                            'total_trades': total_tracked_pdf,  # alias for compatibility
-                            'success_rate': f"{weekly_acc_pdf:.0f}%" if total_tracked_pdf > 0 else 'n/a',
-                            'weekly_return': f"{spx_ret_pdf:+.1f}%" if isinstance(spx_ret_pdf, (int, float)) else 'n/a',
+                    week_data = WeekData(
+                        week_start=week_start,
+                        week_end=week_end,
+                        weekly_summary=weekly_summary_text,
+                        performance_metrics={
+                            'total_signals': total_tracked,
+                            'total_trades': total_tracked,  # alias for compatibility
+                            'success_rate': f"{weekly_accuracy:.0f}%" if total_tracked > 0 else 'n/a',
+                            'weekly_return': f"{spx_ret:+.1f}%" if spx_ret is not None else 'n/a',
                             'total_profit': 'n/a',
                             'sharpe_ratio': 'n/a',
                             'max_drawdown': 'n/a',
                         },
-                        # For now we do not fabricate per-day P&L; leave this empty or descriptive only
-                        'daily_performance': [],
-                        'market_analysis': {
-                            'regime': 'See textual weekly report for qualitative regime description',
-                            'volatility': 'See volatility section (no synthetic %)',
-                            'trend_strength': 'Described qualitatively (bullish/neutral/corrective)',
-                            'sector_rotation': 'See sector rotation section',
-                        },
-                        'risk_metrics': {
-                            'risk_level': 'N/A',
-                            'var_95': 'N/A',
-                            'max_position': 'N/A',
-                            'correlation_risk': 'N/A',
-                        },
-                        'key_events': [],
-                        'next_week_outlook': 'See textual weekly report for qualitative outlook; no synthetic probabilities in PDF.',
-                        'next_week_strategy': [],
-                        'action_items': [],
-                    }
+                    )
                     
-                    pdf_path = Createte_weekly_pdf(week_data)
+                    pdf_path = Createte_weekly_pdf(asdict(week_data))
                     if pdf_path:
-                        report += f"📄 PDF Report: {pdf_path}\n"
+                        parts.append(f"📄 PDF Report: {pdf_path}\n")
                         
                         # Send PDF via Telegram
                         try:
-                            from telegram_handler import get_telegram_handler
-                            telegram = get_telegram_handler()
+                            telegram = _get_telegram()
                             
                             # week_start/week_end are DD/MM strings; build safe caption
                             caption = f"Weekly Report - {week_start} to {week_end} {now.strftime('%Y')}"
@@ -1059,20 +1273,20 @@ class WeeklyReportGeneratetor:
                             
                             if result.get('success'):
                                 log.info(f"✅ [WEEKLY] PDF sent to Telegram: {result.get('filename')}")
-                                report += f"📤 PDF sent to Telegram successfully\n"
+                                parts.append(f"📤 PDF sent to Telegram successfully\n")
                             else:
                                 log.warning(f"⚠️ [WEEKLY] PDF Telegram sending failed: {result.get('error')}")
-                                report += f"⚠️ PDF Telegram sending failed\n"
+                                parts.append(f"⚠️ PDF Telegram sending failed\n")
                                 
                         except Exception as telegram_error:
                             log.warning(f"⚠️ [WEEKLY] Telegram integration error: {telegram_error}")
-                            report += f"⚠️ Telegram sending error\n"
+                            parts.append(f"⚠️ Telegram sending error\n")
                             
                 except Exception as e:
                     log.warning(f"⚠️ [WEEKLY] PDF Generation failed: {e}")
             
             log.info(f"âœ… [WEEKLY] Generateted complete weekly report")
-            return report
+            return "".join(parts)
             
         except Exception as e:
             log.error(f"âŒ [WEEKLY] Error: {e}")
@@ -1255,10 +1469,6 @@ def main() -> bool:
             
         log.info(f"✅ [WEEKLY-MAIN] Weekly content generated: {len(weekly_content)} chars")
         
-        # Import PDF and Telegram modules
-        from pdf_generator import Createte_weekly_pdf
-        from telegram_handler import get_telegram_handler
-        
         # Create comprehensive weekly data using WeeklyDataAssembler
         log.info("📊 [WEEKLY-MAIN] Using WeeklyDataAssembler for data-driven report...")
         
@@ -1329,7 +1539,7 @@ def main() -> bool:
             # Send PDF to Telegram (skip if SV_SKIP_TELEGRAM=1)
             if not os.environ.get('SV_SKIP_TELEGRAM'):
                 caption = f"📊 [WEEKLY] SV Weekly Report - {datetime.datetime.now().strftime('%d/%m/%Y %H:%M')}"
-                handler = get_telegram_handler()
+                handler = _get_telegram()
                 telegram_result = handler.send_document(pdf_path, caption=caption)
             else:
                 telegram_result = {'success': False, 'skipped': True, 'reason': 'SV_SKIP_TELEGRAM=1'}
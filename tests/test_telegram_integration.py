@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SV - Test integrazione Telegram (connessione + invio di un messaggio reale)
+
+Invia davvero un messaggio nella chat configurata: gira solo con
+SV_TELEGRAM_INTEGRATION=1 e credenziali valide (private.txt o environment).
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'modules'))
+
+pytestmark = pytest.mark.skipif(
+    os.environ.get('SV_TELEGRAM_INTEGRATION') != '1',
+    reason="set SV_TELEGRAM_INTEGRATION=1 to send a real Telegram test message"
+)
+
+
+@pytest.fixture(scope='module')
+def handler():
+    from telegram_handler import get_telegram_handler
+
+    handler = get_telegram_handler()
+    handler._ensure_initialized()  # token/chat risolti al primo uso
+    if not handler.bot_token or handler.bot_token == 'YOUR_BOT_TOKEN_HERE':
+        pytest.skip("Telegram credentials not configured")
+    return handler
+
+
+def test_connection(handler):
+    assert handler.test_connection()
+
+
+def test_single_message(handler):
+    result = handler.send_message(
+        "Test message from SV Content Engine",
+        'morning',
+        {'market_status': 'OPEN', 'day_context': 'Tuesday Test'}
+    )
+
+    assert result['success'], result.get('error')
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SV - Test packing dei messaggi multi-pagina (trigger_common._pack_messages)
+"""
+
+import sys
+from functools import partial
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'modules'))
+
+from telegram_handler import TelegramHandler
+from trigger_common import _pack_messages
+
+TRUNCATED_MARK = "[message truncated - continues..."
+
+
+def _handler() -> TelegramHandler:
+    # Token/chat fittizi: nessun invio, solo formattazione
+    return TelegramHandler(bot_token='test', chat_id='1')
+
+
+def _assert_not_truncated(handler, packed, content_type):
+    for msg in packed:
+        formatted = handler._format_sv_message(content_type, msg)
+        assert TRUNCATED_MARK not in formatted
+        assert len(formatted) <= handler.sv_config['max_message_length']
+
+
+def test_pack_near_limit_with_nfkc_expansion_is_not_truncated():
+    """'…' diventa '...' con NFKC: una stima sul testo grezzo accorperebbe oltre il limite"""
+    handler = _handler()
+    # Due sezioni da ~2000 caratteri grezzi (3997 accorpate) che dopo NFKC superano i 4096
+    section = ("Market update … " * 150)[:1995]
+    messages = [section, section, "short tail"]
+    fits = partial(handler.fits_in_message, content_type='press_review')
+
+    packed = _pack_messages(messages, fits)
+
+    assert len(packed) >= 2
+    _assert_not_truncated(handler, packed, 'press_review')
+
+
+def test_pack_respects_header_budget_at_the_boundary():
+    """Il candidato accettato deve entrare nel budget reale (header + margine inclusi)"""
+    handler = _handler()
+    budget = handler.sv_config['max_message_length']
+    for size in range(budget - 160, budget - 20, 7):
+        first = "a" * (size // 2)
+        second = "b" * (size - len(first) - 7)  # 7 = len(_PACK_SEPARATOR)
+        fits = partial(handler.fits_in_message, content_type='evening')
+
+        packed = _pack_messages([first, second], fits)
+
+        _assert_not_truncated(handler, packed, 'evening')
+
+
+def test_pack_merges_small_messages():
+    handler = _handler()
+    fits = partial(handler.fits_in_message, content_type='summary')
+
+    packed = _pack_messages(["one", "two", "three"], fits)
+
+    assert packed == ["one\n\n---\n\ntwo\n\n---\n\nthree"]
+
+
+def test_pack_keeps_open_code_blocks_separate():
+    handler = _handler()
+    fits = partial(handler.fits_in_message, content_type='summary')
+
+    packed = _pack_messages(["```start", "end```", "plain"], fits)
+
+    assert packed[0] == "```start"